@@ -0,0 +1,210 @@
+import time
+import pygame
+from collections.abc import Mapping
+
+
+class AssetManager:
+    '''
+    Carrega imagens, sons, fontes e textos somente no primeiro uso e guarda
+    o resultado, para que cada arquivo seja lido e processado uma única vez.
+    '''
+
+    def __init__(self, font_path='freesansbold.ttf'):
+        '''
+        Args:
+            font_path (string): arquivo de fonte usado por todos os textos
+        '''
+        self.font_path = font_path
+
+        self.assets = {}
+
+    def __load(self, key, loader):
+        '''Returns: o recurso guardado em key, carregando-o com loader se ainda não existir'''
+        if key not in self.assets:
+            self.assets[key] = loader()
+
+        return self.assets[key]
+
+    def font(self, size):
+        '''Returns: pygame.font.Font do tamanho indicado'''
+        def load():
+            if not pygame.font.get_init():
+                pygame.font.init()
+
+            return pygame.font.Font(self.font_path, size)
+
+        return self.__load(('font', size), load)
+
+    def image(self, path, size=None):
+        '''
+        Args:
+            path (string): caminho para o arquivo de imagem
+            size (list): largura e altura para redimensionar a imagem, opcional
+
+        Returns: pygame.Surface com a imagem carregada
+        '''
+        def load():
+            image = pygame.image.load(path)
+            return pygame.transform.scale(image, size) if size else image
+
+        return self.__load(('image', path, tuple(size) if size else None), load)
+
+    def sound(self, path):
+        '''Returns: pygame.mixer.Sound com o som carregado'''
+        def load():
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+
+            return pygame.mixer.Sound(path)
+
+        return self.__load(('sound', path), load)
+
+    def text(self, text, font_size, color=[0, 0, 0]):
+        '''
+        Returns: pygame.Surface com o texto renderizado. Diferente de render_font,
+        o resultado nunca sai do cache, por isso deve ser usado para textos fixos.
+        O texto é renderizado diretamente, sem passar pelo cache LRU de render_font,
+        para não ocupar o espaço dos textos que mudam.
+        '''
+        return self.__load(
+            ('text', text, font_size, tuple(color)),
+            lambda: self.font(font_size).render(text, True, color)
+        )
+
+    def loaded_count(self, kind=None):
+        '''
+        Args:
+            kind (string): 'font', 'image', 'sound' ou 'text', opcional; o padrão conta todos
+
+        Returns: número de recursos já carregados
+        '''
+        if kind is None:
+            return len(self.assets)
+
+        return sum(1 for key in self.assets if key[0] == kind)
+
+
+class TextPrerenderer:
+    '''
+    Renderiza antecipadamente, um pouco por vez, um conjunto fixo de textos
+    guardados pelo AssetManager. Cada chamada a step usa no máximo o tempo
+    indicado, então o trabalho pode ser espalhado pelos quadros de uma tela
+    parada (como o menu) sem atrasá-los. Textos pedidos antes de serem
+    preparados são renderizados na hora, como de costume.
+    '''
+
+    def __init__(self, assets, texts, font_size, color=[0, 0, 0]):
+        '''
+        Args:
+            assets (AssetManager): onde os textos renderizados ficam guardados
+            texts (iterable): textos a preparar, percorridos uma única vez e na ordem dada
+            font_size (int): tamanho da fonte de todos os textos
+            color (list): cor de todos os textos
+        '''
+        self.assets = assets
+        self.font_size = font_size
+        self.color = color
+
+        self.pending = iter(texts)
+
+        self.done = False
+
+    def get(self, text):
+        '''Returns: pygame.Surface com o texto, preparado antes ou renderizado agora'''
+        return self.assets.text(text, self.font_size, self.color)
+
+    def step(self, budget_ms=None):
+        '''
+        Prepara os próximos textos até esgotar o tempo.
+
+        Args:
+            budget_ms (float): tempo máximo em milissegundos; sem limite, prepara todos
+        '''
+        if self.done:
+            return
+
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+
+        for text in self.pending:
+            self.get(text)
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+
+        self.done = True
+
+
+class SpriteCache:
+    '''
+    Guarda as imagens convertidas para o formato de pixels da tela. Cada imagem
+    é convertida uma única vez, depois que a tela existe, e a mesma superfície
+    é compartilhada por todos que a desenham, o que deixa os blits no caminho rápido.
+    '''
+
+    def __init__(self):
+        self.sprites = {}
+
+        self.display = None
+
+    def get(self, image):
+        '''
+        Args:
+            image (pygame.Surface): imagem carregada, como as de GAME_CONSTANTS
+
+        Returns:
+            pygame.Surface: a imagem no formato da tela (compartilhada, não deve ser alterada)
+        '''
+        display = pygame.display.get_surface()
+
+        # Uma nova tela pode ter outro formato de pixels
+        if display is not self.display:
+            self.sprites.clear()
+            self.display = display
+
+        key = id(image)
+
+        if key not in self.sprites:
+            if image.get_flags() & pygame.SRCALPHA:
+                converted = image.convert_alpha()
+            else:
+                converted = image.convert()
+
+            # A imagem original é guardada junto para que seu id não seja reutilizado
+            self.sprites[key] = (image, converted)
+
+        return self.sprites[key][1]
+
+    def memory_bytes(self):
+        '''Returns: memória total, em bytes, ocupada pelas superfícies convertidas'''
+        return sum(converted.get_pitch() * converted.get_height() for _, converted in self.sprites.values())
+
+
+class LazyConstants(Mapping):
+    '''
+    Dicionário de constantes cujos valores podem ser funções de carregamento.
+    Uma função é chamada somente quando sua chave é lida pela primeira vez,
+    e o resultado substitui a função. Os demais valores são guardados como estão.
+    '''
+
+    def __init__(self, values):
+        self.__values = dict(values)
+
+    def __getitem__(self, key):
+        value = self.__values[key]
+
+        if callable(value):
+            value = value()
+            self.__values[key] = value
+
+        return value
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def prefetch(self):
+        '''Carrega todos os valores que ainda não foram carregados'''
+        for key in self.__values:
+            self[key]
@@ -0,0 +1,198 @@
+import sys
+import threading
+import pygame
+from collections import deque
+
+
+class AudioManager:
+    '''
+    Cuida de todo o som do jogo. O mixer é configurado com um buffer pequeno,
+    para que os efeitos toquem logo depois da tecla. Cada efeito tem seus
+    próprios canais reservados, que nunca são tomados por outros sons. As
+    músicas são carregadas em segundo plano para a memória uma única vez, e
+    a troca entre elas é feita com um crossfade entre dois canais, sem ler
+    o disco no laço de quadros. Arquivos de música ausentes são ignorados.
+    '''
+
+    def __init__(self, pools, frequency=44100, buffer=512, fade_ms=500):
+        '''
+        Configura o mixer antes de pygame.init, então deve ser criado antes dele.
+
+        Args:
+            pools (dict): mapeia o nome de cada efeito para o número de canais reservados a ele
+            frequency (int): taxa de amostragem do mixer
+            buffer (int): amostras por buffer; quanto menor, menor o atraso dos efeitos
+            fade_ms (int): duração padrão do crossfade entre músicas
+        '''
+        pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+        self.pools = dict(pools)
+        self.fade_ms = fade_ms
+
+        self.channels = None  # Criados no primeiro uso, depois que o mixer existe
+
+        self.music_paths = {}
+        self.tracks = {}  # Nome da música para o Sound carregado, ou None se o arquivo não abriu
+        self.loading = set()
+
+        self.current_music = None  # Música pedida por último; pode ainda estar carregando
+        self.active_music_channel = 0
+
+        self.lock = threading.Lock()
+
+    def __ready(self):
+        '''
+        Inicializa o mixer, se preciso, e reserva os canais.
+
+        Returns: falso se não houver dispositivo de áudio; nesse caso nada toca
+        '''
+        if self.channels is not None:
+            return True
+
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                return False
+
+        # Dois canais de música para o crossfade, seguidos dos canais de cada efeito
+        reserved = 2 + sum(self.pools.values())
+
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + 8))
+        pygame.mixer.set_reserved(reserved)
+
+        channels = [pygame.mixer.Channel(i) for i in range(reserved)]
+
+        self.music_channels = channels[:2]
+        self.channels = {}
+
+        start = 2
+
+        # Cada grupo fica em ordem de uso: o canal que tocou há mais tempo vem primeiro
+        for name, count in self.pools.items():
+            self.channels[name] = deque(channels[start:start + count])
+            start += count
+
+        return True
+
+    def play_effect(self, name, sound):
+        '''
+        Toca um efeito em um dos canais reservados a ele: um canal livre, se
+        houver, ou o que começou a tocar há mais tempo.
+
+        Args:
+            name (string): nome do grupo de canais (uma das chaves de pools)
+            sound (pygame.mixer.Sound): som a ser tocado
+        '''
+        if not self.__ready():
+            return
+
+        pool = self.channels[name]
+
+        # Todos ocupados: interrompe o que começou a tocar há mais tempo (o primeiro)
+        channel = next((channel for channel in pool if not channel.get_busy()), pool[0])
+
+        pool.remove(channel)
+        pool.append(channel)
+
+        channel.play(sound)
+
+    def preload_music(self, tracks):
+        '''
+        Começa a carregar músicas em segundo plano.
+
+        Args:
+            tracks (dict): mapeia o nome de cada música para o caminho do arquivo
+        '''
+        self.music_paths.update(tracks)
+
+        if not self.__ready():
+            return
+
+        for name in tracks:
+            self.__start_loading(name)
+
+    def __start_loading(self, name):
+        with self.lock:
+            if name in self.tracks or name in self.loading:
+                return
+
+            self.loading.add(name)
+
+        threading.Thread(target=self.__load_music, args=(name,), name=f'music-{name}', daemon=True).start()
+
+    def __load_music(self, name):
+        '''Carrega e decodifica uma música (fora do laço de quadros) e a toca se ela foi pedida enquanto carregava'''
+        path = self.music_paths.get(name)
+
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, OSError, TypeError) as error:
+            print(f'Música {name} indisponível ({path}): {error}', file=sys.stderr)
+            sound = None
+
+        with self.lock:
+            self.tracks[name] = sound
+            self.loading.discard(name)
+
+            if self.current_music == name:
+                self.__crossfade(sound, self.fade_ms)
+
+    def play_music(self, name, fade_ms=None):
+        '''
+        Troca a música atual pela indicada, em loop, com crossfade. Se ela ainda
+        estiver carregando, começa assim que terminar; o laço de quadros não espera.
+
+        Args:
+            name (string): nome da música (ver preload_music)
+            fade_ms (int): duração do crossfade, opcional
+        '''
+        if not self.__ready():
+            return
+
+        with self.lock:
+            if name == self.current_music:
+                return
+
+            self.current_music = name
+
+            loaded = name in self.tracks
+
+            if loaded:
+                self.__crossfade(self.tracks[name], self.fade_ms if fade_ms is None else fade_ms)
+
+        if not loaded:
+            self.__start_loading(name)
+
+    def __crossfade(self, sound, fade_ms):
+        '''Diminui a música do canal ativo e aumenta a nova no outro canal. Chamada com self.lock adquirido'''
+        old = self.music_channels[self.active_music_channel]
+
+        if fade_ms:
+            old.fadeout(fade_ms)
+        else:
+            old.stop()
+
+        self.active_music_channel ^= 1
+
+        if sound is not None:
+            self.music_channels[self.active_music_channel].play(sound, loops=-1, fade_ms=fade_ms)
+
+    def stop_music(self, fade_ms=0):
+        '''
+        Pára a música atual.
+
+        Args:
+            fade_ms (int): duração da diminuição do volume; 0 pára na hora
+        '''
+        if not self.__ready():
+            return
+
+        with self.lock:
+            self.current_music = None
+
+        for channel in self.music_channels:
+            if fade_ms:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
@@ -0,0 +1,280 @@
+'''
+Mede o custo por quadro de cada tela (render_frame) usando os drivers
+"dummy" do SDL. Para cada caso são informados os percentis p50/p95/p99
+do tempo de quadro e a memória alocada por quadro. O jogo é medido com
+diferentes quantidades de ninjas inimigos e shurikens vivos.
+
+Também é medido o tempo até o primeiro quadro do menu ao iniciar o jogo.
+
+Quando existe um arquivo de referência (baseline), o script termina com
+erro se o p95 de algum caso piorar além da tolerância.
+
+Uso:
+    python benchmarks.py                      # mede e compara com a referência
+    python benchmarks.py --save-baseline      # mede e salva uma nova referência
+    python benchmarks.py --sizes 10 100 --frames 60
+'''
+import offscreen  # Escolhe os drivers "dummy" do SDL; precisa vir antes do pygame
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import pygame
+from constants import SCREEN_NAMES, STEP_MS, GAME_CONSTANTS, assets, prefetch, sprites
+from entity_store import RIGHT, LEFT
+from game import HardGame
+from game_utils import question_texts
+from high_scores import HighScores
+from menu import Menu
+from rules import Rules
+from utils import text_cache, percentile
+
+pygame.init()
+
+GAME_SIZES = [10, 100, 1000, 10000]
+
+
+def measure(render, frames, max_seconds, setup=None):
+    '''
+    Executa render repetidamente e mede o tempo de cada quadro. Em uma
+    segunda passagem, mais curta, mede a memória alocada por quadro com
+    tracemalloc (que distorceria as medidas de tempo).
+
+    Args:
+        render (callable): função que gera um quadro
+        frames (int): número máximo de quadros medidos
+        max_seconds (float): tempo máximo gasto na medição de tempo
+        setup (callable): executada antes de cada quadro, fora da medição
+
+    Returns:
+        dict: percentis em milissegundos, quadros medidos e KiB alocados por quadro
+    '''
+    times = []
+    deadline = time.perf_counter() + max_seconds
+
+    while len(times) < frames and (len(times) < 3 or time.perf_counter() < deadline):
+        if setup:
+            setup()
+
+        start = time.perf_counter()
+        render()
+        times.append((time.perf_counter() - start) * 1000)
+
+    allocations = []
+    tracemalloc.start()
+
+    for _ in range(min(len(times), 20)):
+        if setup:
+            setup()
+
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+        before = tracemalloc.get_traced_memory()[0]
+        render()
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+
+    tracemalloc.stop()
+
+    times.sort()
+
+    return {
+        'frames': len(times),
+        'p50': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'p99': percentile(times, 99),
+        'alloc_kib': sum(allocations) / len(allocations) / 1024,
+    }
+
+
+ASSET_KINDS = ['image', 'sound', 'font', 'text']
+
+STARTUP_SCRIPT = '''
+import sys
+import time
+start = time.perf_counter()
+import main
+main.screens['menu']().render_frame()
+print(time.perf_counter() - start)
+from constants import assets
+print(*(assets.loaded_count(kind) for kind in sys.argv[1:]))
+'''
+
+
+def measure_startup(runs):
+    '''
+    Mede o tempo até o primeiro quadro: importar main (e com ele todas as telas)
+    e desenhar o primeiro quadro do menu, cada vez em um novo processo. Também
+    conta os recursos carregados até esse quadro, por tipo: com o carregamento
+    sob demanda, imagens e sons das outras telas ainda não devem estar lá (os
+    textos incluem as perguntas já preparadas pelo menu no primeiro quadro).
+
+    Args:
+        runs (int): número de processos executados
+
+    Returns:
+        dict: percentis em milissegundos, no mesmo formato de measure, e recursos carregados
+    '''
+    times = []
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT, *ASSET_KINDS], capture_output=True, text=True, check=True
+        ).stdout
+        elapsed, loaded = output.splitlines()[-2:]
+
+        times.append(float(elapsed) * 1000)
+
+    times.sort()
+
+    return {
+        'frames': len(times),
+        'p50': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'p99': percentile(times, 99),
+        'alloc_kib': None,
+        'assets': dict(zip(ASSET_KINDS, map(int, loaded.split()))),
+    }
+
+
+def game_case(size):
+    '''
+    Cria um jogo com um número fixo de entidades vivas: metade shurikens
+    indo para a direita e metade ninjas inimigos vindos da esquerda,
+    posicionados de forma que não colidam entre si nem com o ninja meditador.
+    Antes de cada quadro as entidades voltam às posições iniciais.
+
+    Args:
+        size (int): número total de entidades vivas
+
+    Returns:
+        tuple: (função que gera um quadro, função de preparação do quadro)
+    '''
+    game = HardGame(headless=True)
+
+    shurikens = game.shuriken_controller.shurikens
+    enemy_ninjas = game.enemy_ninja_controller.enemy_ninjas
+
+    shuriken_x = [360 + (i * 7) % 280 for i in range(size // 2)]
+    enemy_ninja_x = [-80 + (i * 3) % 200 for i in range(size - size // 2)]
+
+    def setup():
+        shurikens.clear()
+        shurikens.spawn_many(
+            shuriken_x, 321, GAME_CONSTANTS['SHURIKEN_SPEED'], RIGHT, GAME_CONSTANTS['SHURIKEN_SIZE']
+        )
+
+        enemy_ninjas.clear()
+        enemy_ninjas.spawn_many(
+            enemy_ninja_x, 301, GAME_CONSTANTS['ENEMY_NINJA_SPEED'], LEFT, GAME_CONSTANTS['ENEMY_NINJA_SIZE']
+        )
+
+        # Cada quadro medido executa exatamente um passo de simulação
+        game.accumulator = STEP_MS
+        game.last_frame_time = pygame.time.get_ticks()
+        game.run = True
+
+    return game.render_frame, setup
+
+
+def run_benchmarks(frames, max_seconds, sizes):
+    '''
+    Returns: dict que mapeia o nome de cada caso aos seus resultados
+    '''
+    results = {'startup': measure_startup(5)}
+
+    for screen_name in SCREEN_NAMES:
+        prefetch(screen_name)
+
+    # Sem isso, os primeiros quadros do menu medem também o preparo das perguntas
+    question_texts.step()
+
+    for name, screen_class in [('menu', Menu), ('rules', Rules), ('high_scores', HighScores)]:
+        screen = screen_class()
+        results[name] = measure(screen.render_frame, frames, max_seconds)
+
+    for size in sizes:
+        render, setup = game_case(size)
+        results[f'game_{size}'] = measure(render, frames, max_seconds, setup)
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    '''
+    Compara o p95 de cada caso com a referência.
+
+    Returns: lista de mensagens descrevendo cada regressão
+    '''
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        limit = baseline[name]['p95'] * (1 + tolerance)
+
+        if result['p95'] > limit:
+            regressions.append(
+                f"{name}: p95 {result['p95']:.3f}ms > {limit:.3f}ms (referência {baseline[name]['p95']:.3f}ms)"
+            )
+
+    return regressions
+
+
+def print_report(results):
+    '''Imprime uma tabela com os resultados de cada caso'''
+    print(f"{'caso':<14}{'quadros':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'KiB/quadro':>12}")
+
+    for name, result in results.items():
+        alloc = '-' if result['alloc_kib'] is None else f"{result['alloc_kib']:.1f}"
+
+        print(
+            f"{name:<14}{result['frames']:>9}{result['p50']:>10.3f}{result['p95']:>10.3f}"
+            f"{result['p99']:>10.3f}{alloc:>12}"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mede o custo por quadro de cada tela')
+    parser.add_argument('--frames', type=int, default=300, help='quadros medidos por caso')
+    parser.add_argument('--max-seconds', type=float, default=5, help='tempo máximo por caso')
+    parser.add_argument('--sizes', type=int, nargs='+', default=GAME_SIZES, help='entidades vivas no jogo')
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help='arquivo de referência')
+    parser.add_argument('--save-baseline', action='store_true', help='salva os resultados como referência')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='piora relativa aceita no p95')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.frames, args.max_seconds, args.sizes)
+    print_report(results)
+
+    cache_info = text_cache.info()
+    print(f"Cache de textos: {cache_info['hits']} acertos, {cache_info['misses']} falhas, "
+          f"{cache_info['size']}/{cache_info['maxsize']} superfícies")
+    print(f'Cache de sprites: {len(sprites.sprites)} imagens, {sprites.memory_bytes() / 1024:.1f} KiB')
+    loaded = results['startup']['assets']
+    print('Recursos carregados até o primeiro quadro do menu: '
+          + ', '.join(f'{loaded[kind]}/{assets.loaded_count(kind)} {kind}' for kind in ASSET_KINDS)
+          + ' (de todos os usados pelas telas)')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+        print(f'Referência salva em {args.baseline}')
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f'Nenhuma referência encontrada em {args.baseline}')
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+
+    for regression in regressions:
+        print(f'REGRESSÃO {regression}')
+
+    sys.exit(1 if regressions else 0)
@@ -1,72 +1,149 @@
+import os
 import pygame
-from utils import render_font
+from assets import AssetManager, LazyConstants, SpriteCache
+from audio import AudioManager
+from utils import RankingWriter
+from profiler import FrameProfiler
 
-pygame.font.init()
-pygame.mixer.init()
+# Imagens, sons, fontes e textos são carregados no primeiro uso (ver assets.py)
+assets = AssetManager()
+
+# Mixer com buffer pequeno e canais reservados para cada efeito; criado antes de pygame.init
+audio = AudioManager({'shuriken': 2, 'gong': 1})
+
+MUSIC_TRACKS = {
+    'calm': 'music/music_calm.wav',
+    'game': 'music/game_soundtrack.wav',
+}
+
+# Imagens convertidas para o formato da tela, compartilhadas por todas as entidades
+sprites = SpriteCache()
 
 SCREEN_NAMES = ['menu', 'hard_game', 'easy_game', 'how_to_play', 'high_scores']
 
-TINY_FONT = pygame.font.Font('freesansbold.ttf', 17)
-SMALL_FONT = pygame.font.Font('freesansbold.ttf', 18)
-INTERMEDIATE_FONT = pygame.font.Font('freesansbold.ttf', 24)
-MEDIUM_FONT = pygame.font.Font('freesansbold.ttf', 26)
-BIG_FONT = pygame.font.Font('freesansbold.ttf', 34)
+FRAME_RATE = 60  # Limite de quadros desenhados por segundo; não altera a velocidade do jogo
+
+SIMULATION_RATE = 60  # Passos de simulação por segundo; as velocidades são em pixels por passo
+STEP_MS = 1000 / SIMULATION_RATE
+MAX_FRAME_MS = 250  # Um quadro mais lento que isso não é recuperado por inteiro
+
+# Arquivo do ranking: texto (padrão) ou banco SQLite, se terminar em .db, .sqlite ou .sqlite3
+RANKING_PATH = os.environ.get('MEDITATING_DOG_RANKING', 'high_scores.txt')
 
+# Os recordes são gravados em segundo plano (ver RankingWriter em utils.py)
+ranking_writer = RankingWriter(RANKING_PATH)
 
-MENU_CONSTANTS = {
-    'TITLE': render_font('The Meditating Dog', font=BIG_FONT),
-    'NAME': render_font('SEU NOME: ', font=MEDIUM_FONT),
-    'NAME_BOX': pygame.Surface([250, 40]),
-    'WARNING': render_font('Digite seu nome antes de jogar', font=SMALL_FONT),
-    'NINJA_IMAGE': pygame.transform.scale(pygame.image.load('images/m_ninja.png'), [183, 198]),
+# Tempos de cada fase dos quadros do jogo (F3 mostra na tela). Com a variável
+# MEDITATING_DOG_PROFILE, os últimos quadros são gravados nesse arquivo CSV ao sair.
+PROFILE_PHASES = ['events', 'update', 'collisions', 'background', 'panel', 'shurikens', 'enemies', 'overlay', 'display']
+profiler = FrameProfiler(PROFILE_PHASES, csv_path=os.environ.get('MEDITATING_DOG_PROFILE'))
+
+# Pasta onde as partidas são gravadas para replay (ver replay.py); sem a variável, nada é gravado
+RECORDINGS_DIR = os.environ.get('MEDITATING_DOG_RECORDINGS')
+
+FONT_SIZES = {
+    'TINY_FONT': 17,
+    'SMALL_FONT': 18,
+    'INTERMEDIATE_FONT': 24,
+    'MEDIUM_FONT': 26,
+    'BIG_FONT': 34,
 }
 
-MENU_CONSTANTS['NAME_BOX'].fill([255, 255, 255])
 
+def __getattr__(name):
+    '''Carrega as fontes (TINY_FONT, SMALL_FONT, ...) somente quando são importadas'''
+    if name in FONT_SIZES:
+        return assets.font(FONT_SIZES[name])
+
+    raise AttributeError(f"module 'constants' has no attribute '{name}'")
+
+
+def make_name_box():
+    '''Returns: caixa branca onde o nome do jogador é digitado'''
+    name_box = pygame.Surface([250, 40])
+    name_box.fill([255, 255, 255])
 
-GAME_CONSTANTS = {
-    'GATE_IMAGE': pygame.transform.scale(pygame.image.load('images/gate.png'), [396, 295]),
-    'NINJA_IMAGE': pygame.transform.scale(pygame.image.load('images/m_ninja.png'), [110, 119]),
+    return name_box
+
+
+MENU_CONSTANTS = LazyConstants({
+    'TITLE': lambda: assets.text('The Meditating Dog', FONT_SIZES['BIG_FONT']),
+    'NAME': lambda: assets.text('SEU NOME: ', FONT_SIZES['MEDIUM_FONT']),
+    'NAME_BOX': make_name_box,
+    'WARNING': lambda: assets.text('Digite seu nome antes de jogar', FONT_SIZES['SMALL_FONT']),
+    'NINJA_IMAGE': lambda: assets.image('images/m_ninja.png', [183, 198]),
+})
+
+
+GAME_CONSTANTS = LazyConstants({
+    'SCREEN_WIDTH': 675,
+
+    'GATE_IMAGE': lambda: assets.image('images/gate.png', [396, 295]),
+    'NINJA_IMAGE': lambda: assets.image('images/m_ninja.png', [110, 119]),
     'NINJA_SIZE': [110, 119],
     'NINJA_POSITION': [245, 281],
 
-    'SHURIKEN_IMAGE': pygame.transform.scale(pygame.image.load('images/shuriken.png'), [30, 30]),
+    'SHURIKEN_IMAGE': lambda: assets.image('images/shuriken.png', [30, 30]),
     'SHURIKEN_SIZE': [30, 30],
     'SHURIKEN_POSITION': ([335, 321], [235, 321]),  # RIGHT, LEFT
     'SHURIKEN_SPEED': 8,
+    'SHURIKEN_CAPACITY': 16,
 
-    'ENEMY_NINJA_IMAGE': [pygame.transform.scale(pygame.image.load('images/redninja_right.png'), [82, 98]), pygame.transform.scale(pygame.image.load('images/redninja_left.png'), [82, 98])],
+    'ENEMY_NINJA_IMAGE': lambda: [assets.image('images/redninja_right.png', [82, 98]), assets.image('images/redninja_left.png', [82, 98])],
     'ENEMY_NINJA_SIZE': [82, 99],
     'ENEMY_NINJA_POSITION': ([650, 301], [-132, 301]),
     'ENEMY_NINJA_SPEED': 3,
-
-    'PANEL_SHURIKEN_IMAGE': pygame.transform.scale(pygame.image.load('images/shuriken.png'), [35, 35]),
-
-    'GONG_SOUND': pygame.mixer.Sound('sounds/gong.ogg'),
-    'SHURIKEN_SOUND': pygame.mixer.Sound('sounds/shuriken.ogg'),
+    'ENEMY_NINJA_CAPACITY': 8,
+
+    'PANEL_SHURIKEN_IMAGE': lambda: assets.image('images/shuriken.png', [35, 35]),
+
+    'GONG_SOUND': lambda: assets.sound('sounds/gong.ogg'),
+    'SHURIKEN_SOUND': lambda: assets.sound('sounds/shuriken.ogg'),
+})
+
+
+RULES_CONSTANTS = LazyConstants({
+    'TITLE': lambda: MENU_CONSTANTS['TITLE'],
+    'SUBTITLE': lambda: assets.text('Regras', FONT_SIZES['MEDIUM_FONT']),
+    'BACK': lambda: assets.text('Pressione Q para voltar.', FONT_SIZES['MEDIUM_FONT']),
+    'RULE_1': lambda: assets.text('1) Seu objetivo é meditar a fim de ficar mais sábio.', FONT_SIZES['SMALL_FONT']),
+    'RULE_2': lambda: assets.text('2) Você precisa impedir que os ninjas malvados perturbem a meditação.', FONT_SIZES['SMALL_FONT']),
+    'RULE_3': lambda: assets.text('3) Você pode deter os ninjas malvados lançando um shuriken.', FONT_SIZES['SMALL_FONT']),
+    'RULE_4': lambda: assets.text('4) Para lançar um shuriken à sua direita pressione a SETA DIREITA.', FONT_SIZES['SMALL_FONT']),
+    'RULE_5': lambda: assets.text('5) Para jogar um shuriken à sua esquerda pressione a SETA ESQUERDA.', FONT_SIZES['SMALL_FONT']),
+    'RULE_6': lambda: assets.text('6) Você precisa responder a uma pergunta matemática para conseguir um shuriken.', FONT_SIZES['SMALL_FONT']),
+    'RULE_7': lambda: assets.text('7) Para responder, digite um número em seu teclado e pressione RETURN.', FONT_SIZES['SMALL_FONT']),
+    'RULE_8': lambda: assets.text('8) Você recebe um shuriken por resposta correta.', FONT_SIZES['SMALL_FONT']),
+    'RULE_9': lambda: assets.text('9) Você não pode pular uma pergunta.', FONT_SIZES['SMALL_FONT']),
+    'RULE_10': lambda: assets.text('10) Se um ninja malvado chegar até você, o jogo acaba.', FONT_SIZES['SMALL_FONT']),
+    'RULE_11': lambda: assets.text("11) Sua pontuação é o QI final dos ninjas.", FONT_SIZES['SMALL_FONT']),
+})
+
+
+HIGH_SCORES_CONSTANTS = LazyConstants({
+    'TITLE': lambda: MENU_CONSTANTS['TITLE'],
+    'SUBTITLE': lambda: assets.text('Top 10 Pontuações mais altas', FONT_SIZES['MEDIUM_FONT']),
+    'BACK': lambda: RULES_CONSTANTS['BACK'],
+})
+
+
+# Constantes usadas por cada tela, para carregamento antecipado
+SCREEN_ASSETS = {
+    'menu': [MENU_CONSTANTS],
+    'hard_game': [GAME_CONSTANTS],
+    'easy_game': [GAME_CONSTANTS],
+    'how_to_play': [RULES_CONSTANTS],
+    'high_scores': [HIGH_SCORES_CONSTANTS],
 }
 
 
-RULES_CONSTANTS = {
-    'TITLE': MENU_CONSTANTS['TITLE'],
-    'SUBTITLE': render_font('Regras', font=MEDIUM_FONT),
-    'BACK': render_font('Pressione Q para voltar.', font=MEDIUM_FONT),
-    'RULE_1': render_font('1) Seu objetivo é meditar a fim de ficar mais sábio.', font=SMALL_FONT),
-    'RULE_2': render_font('2) Você precisa impedir que os ninjas malvados perturbem a meditação.', font=SMALL_FONT),
-    'RULE_3': render_font('3) Você pode deter os ninjas malvados lançando um shuriken.', font=SMALL_FONT),
-    'RULE_4': render_font('4) Para lançar um shuriken à sua direita pressione a SETA DIREITA.', font=SMALL_FONT),
-    'RULE_5': render_font('5) Para jogar um shuriken à sua esquerda pressione a SETA ESQUERDA.', font=SMALL_FONT),
-    'RULE_6': render_font('6) Você precisa responder a uma pergunta matemática para conseguir um shuriken.', font=SMALL_FONT),
-    'RULE_7': render_font('7) Para responder, digite um número em seu teclado e pressione RETURN.', font=SMALL_FONT),
-    'RULE_8': render_font('8) Você recebe um shuriken por resposta correta.', font=SMALL_FONT),
-    'RULE_9': render_font('9) Você não pode pular uma pergunta.', font=SMALL_FONT),
-    'RULE_10': render_font('10) Se um ninja malvado chegar até você, o jogo acaba.', font=SMALL_FONT),
-    'RULE_11': render_font("11) Sua pontuação é o QI final dos ninjas.", font=SMALL_FONT),
-}
+def prefetch(screen_name):
+    '''
+    Carrega antecipadamente todos os recursos de uma tela, para que a
+    primeira exibição dela não precise ler arquivos.
 
-
-HIGH_SCORES_CONSTANTS = {
-    'TITLE': MENU_CONSTANTS['TITLE'],
-    'SUBTITLE': render_font('Top 10 Pontuações mais altas', font=MEDIUM_FONT),
-    'BACK': RULES_CONSTANTS['BACK'],
-}
+    Args:
+        screen_name (string): um dos nomes em SCREEN_NAMES
+    '''
+    for constants in SCREEN_ASSETS[screen_name]:
+        constants.prefetch()
@@ -0,0 +1,163 @@
+import numpy as np
+
+RIGHT = 0
+LEFT = 1
+
+
+class EntityStore:
+    '''
+    Guarda todas as entidades móveis de um tipo (shurikens ou ninjas inimigos)
+    em matrizes contíguas do NumPy, uma matriz por atributo: posição, velocidade,
+    lado e tamanho. Assim, todas as entidades são movidas e testadas em uma
+    única operação vetorizada por quadro, em vez de um objeto Python por entidade.
+    '''
+
+    def __init__(self, capacity=16):
+        '''
+        Reserva espaço para um número inicial de entidades. O espaço dobra
+        quando fica cheio, e as posições livres são reaproveitadas.
+
+        Args:
+            capacity (int): número inicial de entidades que cabem nas matrizes
+        '''
+        self.count = 0
+
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.velocity = np.zeros(capacity, dtype=np.int32)
+        self.side = np.zeros(capacity, dtype=np.int8)
+        self.width = np.zeros(capacity, dtype=np.int32)
+        self.height = np.zeros(capacity, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def __fields(self):
+        return ['x', 'y', 'velocity', 'side', 'width', 'height']
+
+    def __reserve(self, count):
+        '''Garante que as matrizes tenham espaço para pelo menos count entidades'''
+        capacity = len(self.x)
+
+        if count <= capacity:
+            return
+
+        while capacity < count:
+            capacity *= 2
+
+        for field in self.__fields():
+            old = getattr(self, field)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, field, new)
+
+    def spawn(self, position, velocity, side, size):
+        '''
+        Adiciona uma entidade ao final das matrizes.
+
+        Args:
+            position (list): posição x-y inicial
+            velocity (int): pixels percorridos por passo (negativo para a esquerda)
+            side (int): RIGHT ou LEFT
+            size (list): largura e altura
+        '''
+        self.__reserve(self.count + 1)
+
+        i = self.count
+        self.x[i], self.y[i] = position
+        self.velocity[i] = velocity
+        self.side[i] = side
+        self.width[i], self.height[i] = size
+
+        self.count += 1
+
+    def spawn_many(self, x, y, velocity, side, size):
+        '''
+        Adiciona várias entidades de uma só vez. Cada argumento pode ser
+        um valor único ou uma sequência com um valor por entidade.
+
+        Args:
+            x (array): coordenadas x iniciais, define quantas entidades são criadas
+            size (list): largura e altura, iguais para todas
+        '''
+        x = np.asarray(x)
+        start, end = self.count, self.count + len(x)
+
+        self.__reserve(end)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.velocity[start:end] = velocity
+        self.side[start:end] = side
+        self.width[start:end], self.height[start:end] = size
+
+        self.count = end
+
+    def clear(self):
+        '''Remove todas as entidades, mantendo o espaço reservado'''
+        self.count = 0
+
+    def step(self):
+        '''Move todas as entidades de acordo com suas velocidades'''
+        n = self.count
+
+        if n:
+            self.x[:n] += self.velocity[:n]
+
+    def middles(self):
+        '''Returns: matriz com a coordenada x do centro de cada entidade'''
+        n = self.count
+        return self.x[:n] + self.width[:n] // 2
+
+    def has_left_screen(self, screen_width):
+        '''
+        Args:
+            screen_width (int): largura da tela em pixels
+
+        Returns: matriz de bool indicando as entidades que já saíram da tela
+            pelo lado para onde se movem
+        '''
+        n = self.count
+        x, velocity = self.x[:n], self.velocity[:n]
+
+        return ((velocity > 0) & (x > screen_width)) | ((velocity < 0) & (x + self.width[:n] < 0))
+
+    def cull(self, screen_width):
+        '''Descarta as entidades que já saíram da tela (ver has_left_screen)'''
+        if self.count:
+            self.keep(~self.has_left_screen(screen_width))
+
+    def keep(self, mask):
+        '''
+        Compacta as matrizes mantendo somente as entidades marcadas, na mesma ordem.
+
+        Args:
+            mask (array): matriz de bool com uma posição por entidade
+        '''
+        kept = int(np.count_nonzero(mask))
+
+        if kept == self.count:
+            return
+
+        for field in self.__fields():
+            values = getattr(self, field)
+            values[:kept] = values[:self.count][mask]
+
+        self.count = kept
+
+    def remove(self, indices):
+        '''
+        Remove as entidades nas posições indicadas.
+
+        Args:
+            indices (array): índices das entidades a serem removidas
+        '''
+        mask = np.ones(self.count, dtype=bool)
+        mask[indices] = False
+
+        self.keep(mask)
+
+    def positions(self):
+        '''Returns: lista de posições x-y prontas para serem usadas por pygame'''
+        n = self.count
+        return list(zip(self.x[:n].tolist(), self.y[:n].tolist()))
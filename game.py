@@ -1,7 +1,10 @@
 import pygame
-from constants import SCREEN_NAMES, GAME_CONSTANTS
-from utils import Ranking, Screen
-from game_utils import MeditatingNinja, Panel, ShurikenController, EnemyNinjaController, CollisionController
+import random
+from constants import SCREEN_NAMES, audio, SIMULATION_RATE, STEP_MS, MAX_FRAME_MS, RECORDINGS_DIR, TINY_FONT, GAME_CONSTANTS, profiler, ranking_writer, sprites
+from utils import Screen
+from game_utils import (
+    MeditatingNinja, Panel, ShurikenController, EnemyNinjaController, CollisionController, InputRecorder, GAME_KEYS
+)
 
 
 class Game(Screen):
@@ -9,9 +12,15 @@ class Game(Screen):
     Define a tela do jogo. Herda os métodos da tela de um pai
     classe. Cada quadro desta tela é gerado pela execução do
     função render_frame uma vez.
+    A simulação avança em passos de duração fixa (STEP_MS), independentes
+    da taxa de quadros: um quadro lento executa vários passos para
+    recuperar o atraso, e um quadro rápido pode não executar nenhum.
     '''
 
-    def __init__(self, name='', is_easy=False):
+    # O jogo é redesenhado inteiro a cada quadro, então não precisa de VIDEOEXPOSE
+    EVENT_TYPES = [pygame.QUIT, pygame.KEYDOWN]
+
+    def __init__(self, name='', is_easy=False, headless=False, seed=None, spawn_interval=None):
         '''
         Inicializa os atributos da classe mãe, pára a música do menu
         jogando e tocando música de jogo, instanciam todos os objetos que
@@ -20,85 +29,238 @@ class Game(Screen):
         Args:
             name (string): nome do jogador, opcional
             is_easy (bool): dificuldade do jogo, o padrão é difícil (is_easy=False)
+            headless (bool): se verdadeiro, o jogo é avançado por chamadas a tick,
+                sem música e sem salvar a pontuação
+            seed (int): semente do gerador aleatório da partida; se omitida,
+                uma semente nova é sorteada. A mesma semente e as mesmas teclas
+                nos mesmos passos reproduzem a mesma partida.
+            spawn_interval (float): milissegundos entre inimigos, opcional; o padrão
+                depende da dificuldade (ver stress.py para testes de carga)
         '''
         super().__init__(name)
 
-        pygame.mixer.music.stop()
-        pygame.mixer.music.load('music/game_soundtrack.wav')
-        pygame.mixer.music.play(-1)
+        self.headless = headless
+
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        self.step_count = 0
+        self.recorder = InputRecorder(self.seed, is_easy, name)
 
-        self.gate_image = GAME_CONSTANTS['GATE_IMAGE']
+        if not headless:
+            audio.play_music('game')
+
+        self.gate_image = sprites.get(GAME_CONSTANTS['GATE_IMAGE'])
 
         self.meditating_ninja = MeditatingNinja()
 
-        self.panel = Panel(is_easy)
+        self.background = self.compose_background()
+
+        self.panel = Panel(is_easy, self.rng)
 
         self.shuriken_controller = ShurikenController(self.panel)
 
         # O tempo de reprodução entre inimigos varia com dificuldade
-        spawn_interval = 5000 if is_easy else 1500
-        self.enemy_ninja_controller = EnemyNinjaController(spawn_interval)
+        if spawn_interval is None:
+            spawn_interval = 5000 if is_easy else 1500
+
+        self.enemy_ninja_controller = EnemyNinjaController(spawn_interval, self.rng)
 
         self.collision_controller = CollisionController(
-            self.meditating_ninja, self.shuriken_controller, self.enemy_ninja_controller, self.panel, self.on_game_over
+            self.meditating_ninja, self.shuriken_controller, self.enemy_ninja_controller, self.panel, self.on_game_over,
+            gameover_steps=0 if headless else 2 * SIMULATION_RATE  # 2 segundos de gongo com a tela parada
         )
 
-    def on_game_over(self):
+        self.results_saved = False
+
+        # Tempo real ainda não simulado, em milissegundos
+        self.accumulator = 0
+        self.last_frame_time = pygame.time.get_ticks()
+
+    def compose_background(self):
         '''
-        Salva a pontuação do usuário para o arquivo de texto de alta pontuação,
-        estabelece um redirecionamento para o menu, pára a tela 
-        da execução, e mudanças na música do menu
+        Compõe uma única vez as camadas que nunca mudam (fundo branco, ninja
+        meditador e portão) em uma superfície no formato da tela, para que
+        cada quadro as restaure com um só blit.
+
+        Returns:
+            pygame.Surface: camada de fundo do jogo
         '''
-        ranking = Ranking('high_scores.txt')
-        ranking.new_record(self.name, self.panel.score)
+        background = pygame.Surface(self.screen.get_size()).convert()
+
+        background.fill([255, 255, 255])
+
+        self.meditating_ninja.render(background)
+
+        background.blit(self.gate_image, [105, 105])
 
+        return background
+
+    def on_game_over(self):
+        '''
+        Chamada ao fim da contagem do fim de jogo: estabelece um redirecionamento
+        para o menu, pára a tela da execução, e mudanças na música do menu.
+        A pontuação já foi salva por save_results.
+        '''
         self.set_next_screen(SCREEN_NAMES[0])
 
         self.stop_running()
 
-        pygame.mixer.music.stop()
-        pygame.mixer.music.load('music/music_calm.wav')
-        pygame.mixer.music.play(-1)
+        if self.headless:
+            return
 
-    def render_frame(self):
-        '''Renderiza um quadro do jogo em uma tela de jogos de pygame'''
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.stop_running()
+        audio.play_music('calm')
 
-            if event.type == pygame.USEREVENT:
-                self.enemy_ninja_controller.spawn_enemy_ninjas()
+    def save_results(self):
+        '''
+        Envia a pontuação do usuário para ser gravada no ranking em segundo plano
+        e salva a gravação da partida, uma única vez. É chamada assim que o fim
+        do jogo é detectado, para que fechar a janela durante o gongo não perca a pontuação.
+        '''
+        if self.headless or self.results_saved:
+            return
 
-            if event.type == pygame.KEYDOWN:
-                self.panel.process_keyboard(event.key)
-                self.shuriken_controller.process_keyboard(event.key)
+        self.results_saved = True
+
+        self.save_recording()
+
+        # Gravado em segundo plano: o jogo não espera o arquivo
+        ranking_writer.submit(self.name, self.panel.score)
 
-        self.screen.fill([255, 255, 255])
+    def save_recording(self):
+        '''Salva as teclas da partida em RECORDINGS_DIR, se a gravação estiver ativada'''
+        if RECORDINGS_DIR:
+            self.recorder.save(RECORDINGS_DIR, self.step_count, self.panel.score)
+
+    def process_keyboard(self, key):
+        '''Repassa uma tecla pressionada ao painel e ao controlador de shurikens'''
+        # Teclas sem função no jogo não são nem gravadas; depois do fim do jogo, nenhuma tem
+        if key not in GAME_KEYS or self.collision_controller.is_gameover:
+            return
+
+        self.recorder.record(self.step_count, key)
+
+        self.panel.process_keyboard(key)
+        self.shuriken_controller.process_keyboard(key)
+
+    def update(self):
+        '''Avança a lógica do jogo em um passo: movimenta as entidades e verifica colisões'''
+        self.shuriken_controller.update()
+
+        self.enemy_ninja_controller.update()
+
+        profiler.mark('update')
+
+        self.collision_controller.scan_for_collisions()
 
-        self.meditating_ninja.render(self.screen)
+        if self.collision_controller.is_gameover:
+            self.save_results()
 
-        self.screen.blit(self.gate_image, [105, 105])
+        profiler.mark('collisions')
+
+    def draw(self):
+        '''Desenha o estado atual do jogo na tela, sem alterar a simulação'''
+        self.screen.blit(self.background, [0, 0])
+        profiler.mark('background')
 
         self.panel.render(self.screen)
+        profiler.mark('panel')
 
         self.shuriken_controller.render(self.screen)
+        profiler.mark('shurikens')
 
         self.enemy_ninja_controller.render(self.screen)
+        profiler.mark('enemies')
 
-        self.collision_controller.scan_for_collisions()
+    def step(self):
+        '''
+        Executa um passo de simulação de duração STEP_MS. Depois do fim do
+        jogo, as entidades ficam paradas e o passo só avança a contagem
+        até a volta ao menu.
+        '''
+        self.step_count += 1
+
+        if self.collision_controller.is_gameover:
+            self.collision_controller.advance_gameover()
+            return
+
+        self.enemy_ninja_controller.advance_spawn_timer(STEP_MS)
+
+        self.update()
+
+    def advance(self, elapsed_ms):
+        '''
+        Soma o tempo real decorrido ao acumulador e executa quantos passos
+        fixos couberem nele. O resto fica para o próximo quadro. Quadros
+        muito longos são limitados a MAX_FRAME_MS para o jogo não travar
+        tentando recuperar o atraso.
+
+        Args:
+            elapsed_ms (float): tempo real desde o último quadro
+        '''
+        self.accumulator += min(elapsed_ms, MAX_FRAME_MS)
+
+        while self.accumulator >= STEP_MS and self.run:
+            self.accumulator -= STEP_MS
+            self.step()
+
+    def tick(self, keys=()):
+        '''
+        Avança o jogo em um passo sem desenhar nem ler eventos de pygame.
+        Usado no modo sem janela (ver headless.py).
+
+        Args:
+            keys (iterable): códigos de teclas pressionadas neste passo
+        '''
+        for key in keys:
+            self.process_keyboard(key)
+
+        self.step()
+
+    def render_frame(self):
+        '''Renderiza um quadro do jogo em uma tela de jogos de pygame, medindo cada fase (ver profiler.py)'''
+        profiler.begin_frame()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop_running()
+
+                # Depois do fim do jogo, a gravação já foi salva junto com a pontuação
+                if not self.headless and not self.results_saved:
+                    self.save_recording()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:  # Não faz parte do jogo, então não é gravada
+                    profiler.toggle_overlay()
+                else:
+                    self.process_keyboard(event.key)
+
+        profiler.mark('events')
+
+        now = pygame.time.get_ticks()
+        self.advance(now - self.last_frame_time)
+        self.last_frame_time = now
+
+        profiler.mark('update')
+
+        self.draw()
+
+        profiler.render_overlay(self.screen, TINY_FONT)
+        profiler.mark('overlay')
 
         pygame.display.update()
+        profiler.mark('display')
 
 
 class HardGame(Game):
     '''Define a dificuldade do jogo para dificil. Os inimigos desovam mais rápido, e o jogador ganha mais pontos'''
 
-    def __init__(self, name=''):
-        super().__init__(name, is_easy=False)
+    def __init__(self, name='', headless=False, seed=None, spawn_interval=None):
+        super().__init__(name, is_easy=False, headless=headless, seed=seed, spawn_interval=spawn_interval)
 
 
 class EasyGame(Game):
     '''Define a dificuldade do jogo para facil. Os inimigos desovam mais devagar, e o jogador ganha menos pontos".'''
 
-    def __init__(self, name=''):
-        super().__init__(name, is_easy=True)
+    def __init__(self, name='', headless=False, seed=None, spawn_interval=None):
+        super().__init__(name, is_easy=True, headless=headless, seed=seed, spawn_interval=spawn_interval)
@@ -1,177 +1,188 @@
 import pygame
+import json
 import math
+import os
 import random
 import time
-from constants import INTERMEDIATE_FONT, GAME_CONSTANTS
+import numpy as np
+from functools import partial
+from constants import INTERMEDIATE_FONT, FONT_SIZES, GAME_CONSTANTS, assets, audio, sprites
+from assets import TextPrerenderer
+from entity_store import EntityStore, RIGHT, LEFT
 from utils import render_font
 
 
-class Question:
+def format_question(a, symbol, b):
+    '''Returns: representação em cadeia de uma questão matemática'''
+    return f'{a} {symbol} {b} ='
+
+
+def compose_glyphs(text):
     '''
-    Define um objeto de pergunta matemática. A pergunta é aleatória e pode ser atualizada no mesmo objeto.
+    Monta um texto feito só de caracteres de ANSWER_GLYPHS a partir dos glifos
+    pré-renderizados (ver question_texts), sem renderizar texto.
+
+    Returns:
+        list: pares (glifo, deslocamento x) prontos para serem desenhados em sequência
     '''
+    glyphs = []
 
-    def __init__(self, is_easy):
-        '''
-        Inicializa dois números de forma aleatória, pega uma operação,
-        armazena o resultado, e armazena a cadeia de símbolos da operação.
+    x = 0
 
-        Args:
-            is_easy (bool): se a dificuldade do jogo é fácil ou não
-        '''
+    for character in text:
+        glyph = question_texts.get(character)
 
-        self.is_easy = is_easy
+        glyphs.append((glyph, x))
+
+        x += glyph.get_width()
 
-        if self.is_easy:  # Se o jogo for fácil, somente as tabelas de horários são permitidas
-            self.A = random.randint(0, 9)
-            self.B = random.randint(1, 9)
+    return glyphs
 
-            self.__operation = lambda a, b: (a * b, 'x')
 
-        else:  # O jogo dificil deve ter todas as operações e números maiores
-            self.A = random.randint(0, 12)
-            self.B = random.randint(1, 12)
+class QuestionBank:
+    '''
+    Todas as perguntas possíveis de uma dificuldade, calculadas uma única vez.
+    O sorteio escolhe uma operação e depois um par de números entre os válidos
+    para ela, em tempo constante: não há tentativas repetidas até achar uma
+    divisão exata, porque somente as divisões exatas estão no banco.
+    '''
 
-            # Seleciona aleatoriamente uma função que retornará a resposta e o símbolo de operação
-            self.__operation = random.choice([
-                lambda a, b: (a + b, '+'),
-                lambda a, b: (a - b, '-'),
-                lambda a, b: (a * b, 'x'),
-                lambda a, b: (a / b, '/')
-            ])
+    OPERATIONS = {
+        '+': lambda a, b: a + b,
+        '-': lambda a, b: a - b,
+        'x': lambda a, b: a * b,
+        '/': lambda a, b: a // b,
+    }
 
-        self.answer, self.operation_symbol = self.__operation(self.A, self.B)
+    def __init__(self, symbols, a_range, b_range, weights=None):
+        '''
+        Args:
+            symbols (list): símbolos das operações permitidas (ver OPERATIONS)
+            a_range (range): valores possíveis do primeiro número
+            b_range (range): valores possíveis do segundo número
+            weights (list): peso relativo de cada operação no sorteio, opcional;
+                sem pesos, todas as operações são igualmente prováveis
+        '''
+        self.symbols = list(symbols)
+        self.weights = weights
 
-        self.prevent_non_exact_division()
+        # Para cada operação, a lista de perguntas (A, símbolo, B, resposta)
+        self.questions = {}
 
-    def prevent_non_exact_division(self):
-        '''Continua escolhendo novos números se uma divisão não for exata e atualiza atributos'''
-        if self.operation_symbol != '/':
-            return
+        for symbol in self.symbols:
+            operation = self.OPERATIONS[symbol]
 
-        while (self.A % self.B != 0):
-            self.A = random.randint(0, 12)
-            self.B = random.randint(1, 12)
+            self.questions[symbol] = [
+                (a, symbol, b, operation(a, b))
+                for a in a_range
+                for b in b_range
+                if symbol != '/' or a % b == 0
+            ]
 
-        self.answer, _ = self.__operation(self.A, self.B)
+    def __len__(self):
+        return sum(len(questions) for questions in self.questions.values())
 
-    def new_question(self):
-        '''Realiza o construtor para obter uma nova pergunta aleatória'''
-        self.__init__(is_easy=self.is_easy)
+    def strings(self):
+        '''Returns: lista com a representação em cadeia de todas as perguntas do banco'''
+        return [format_question(a, symbol, b) for questions in self.questions.values() for a, symbol, b, _ in questions]
 
-    def try_answer(self, answer):
+    def sample(self, rng=random):
         '''
-        Verifica se uma resposta está correta ou não
-
         Args:
-            answer (int): resposta à pergunta matemática
+            rng (random.Random): gerador de números aleatórios da partida
 
-        Retorna: booleano representando se a resposta está correta ou não
+        Returns:
+            tuple: (A, símbolo, B, resposta) de uma pergunta sorteada
         '''
-        return int(answer) == self.answer
+        if self.weights is None:
+            symbol = rng.choice(self.symbols)
+        else:
+            symbol = rng.choices(self.symbols, self.weights)[0]
 
-    def get_string(self):
-        '''Returns: representação em cadeia da questão matemática'''
-        return f'{self.A} {self.operation_symbol} {self.B} ='
+        return rng.choice(self.questions[symbol])
 
 
-class MeditatingNinja:
-    '''Define o ninja meditador que aparecerá no jogo'''
+QUESTION_BANKS = {
+    True: QuestionBank(['x'], range(0, 10), range(1, 10)),  # Fácil: somente a tabuada
+    False: QuestionBank(['+', '-', 'x', '/'], range(0, 13), range(1, 13)),  # Difícil: todas as operações e números maiores
+}
 
-    def __init__(self):
-        '''Inicializa a imagem, tamanho e posições do ninja na tela'''
-        self.shape = GAME_CONSTANTS['NINJA_IMAGE']
+# Caracteres que o jogador pode digitar como resposta; cada um é um glifo pré-renderizado
+ANSWER_GLYPHS = '0123456789-'
 
-        self.size = GAME_CONSTANTS['NINJA_SIZE']
+# Tabelas de teclas: código da tecla para o que ela significa no jogo
+KEY_DIGITS = {pygame.K_0 + i: str(i) for i in range(10)}
+KEY_DIRECTIONS = {pygame.K_RIGHT: 'RIGHT', pygame.K_LEFT: 'LEFT'}
 
-        self.position = GAME_CONSTANTS['NINJA_POSITION']
+# Todas as teclas que fazem alguma coisa durante o jogo
+GAME_KEYS = frozenset([*KEY_DIGITS, *KEY_DIRECTIONS, pygame.K_MINUS, pygame.K_BACKSPACE, pygame.K_RETURN])
 
-    def render(self, display):
-        '''Proporciona a ninja meditadora em uma determinada tela de pygame'''
-        display.blit(self.shape, self.position)
+# Textos do painel (glifos da resposta e todas as perguntas), preparados durante o menu
+question_texts = TextPrerenderer(
+    assets,
+    [*ANSWER_GLYPHS, *QUESTION_BANKS[True].strings(), *QUESTION_BANKS[False].strings()],
+    FONT_SIZES['INTERMEDIATE_FONT']
+)
 
 
-class Shuriken:
-    '''Define um shuriken que aparecerá no jogo'''
+class Question:
+    '''
+    Define um objeto de pergunta matemática. A pergunta é aleatória e pode ser atualizada no mesmo objeto.
+    '''
 
-    def __init__(self, direction):
+    def __init__(self, is_easy, rng=random, bank=None):
         '''
-        Inicializa a direção, a imagem, o tamanho, a velocidade e a posição da embarcação, dependendo da direção
+        Sorteia a primeira pergunta do banco da dificuldade e armazena os dois
+        números, o resultado e a cadeia de símbolos da operação.
 
         Args:
-            direção (string): direção para a qual o shuriken se moverá, deve ser: "DIREITA" ou "ESQUERDA".
+            is_easy (bool): se a dificuldade do jogo é fácil ou não
+            rng (random.Random): gerador de números aleatórios da partida,
+                o padrão é o gerador global do módulo random
+            bank (QuestionBank): banco de perguntas, opcional; o padrão é o da dificuldade
         '''
-        self.direction = direction
-
-        self.shape = GAME_CONSTANTS['SHURIKEN_IMAGE']
 
-        self.size = GAME_CONSTANTS['SHURIKEN_SIZE']
-
-        self.speed = GAME_CONSTANTS['SHURIKEN_SPEED']
+        self.is_easy = is_easy
+        self.rng = rng
+        self.bank = bank if bank is not None else QUESTION_BANKS[is_easy]
 
-        init_position = GAME_CONSTANTS['SHURIKEN_POSITION']
-        self.position = init_position[0] if direction == 'RIGHT' else init_position[1]
+        self.new_question()
 
-    def render(self, display):
-        '''Apresenta o shuriken em uma determinada tela de jogos pygame'''
-        display.blit(self.shape, self.position)
+    def new_question(self):
+        '''Sorteia uma nova pergunta do banco'''
+        self.A, self.operation_symbol, self.B, self.answer = self.bank.sample(self.rng)
 
-    def update_position(self):
-        '''
-        Em cada quadro, o shuriken moverá sua velocidade em pixels para sua direção.
-        Acrescentar à coordenada x significa ir para a direita da tela.
-        Subtrair da coordenada x significa ir para a esquerda da tela.
+    def try_answer(self, answer):
         '''
-        if self.direction == 'RIGHT':
-            self.position = self.position[0] + self.speed, self.position[1]
-
-        if self.direction == 'LEFT':
-            self.position = self.position[0] - self.speed, self.position[1]
-
+        Verifica se uma resposta está correta ou não
 
-class EnemyNinja:
-    '''Define um ninja inimigo que aparecerá no jogo'''
+        Args:
+            answer (int): resposta à pergunta matemática
 
-    def __init__(self, side):
+        Retorna: booleano representando se a resposta está correta ou não
         '''
-        Inicializa o lado do ninja (de onde ele vem na tela), forma
-        (imagens que variam dependendo do lado), tamanho, velocidade, posição (varia
-        dependendo do lado).
+        return int(answer) == self.answer
 
-        Args:
-            lado (string): lado de onde os ninjas inimigos vêm, deve ser: "DIREITO" ou "ESQUERDA": lado de onde vêm os ninjas inimigos.
-        '''
-        self.side = side
+    def get_string(self):
+        '''Returns: representação em cadeia da questão matemática'''
+        return format_question(self.A, self.operation_symbol, self.B)
 
-        if side == 'RIGHT':
-            self.shape = GAME_CONSTANTS['ENEMY_NINJA_IMAGE'][0].convert_alpha()
-        else:
-            self.shape = GAME_CONSTANTS['ENEMY_NINJA_IMAGE'][1].convert_alpha()
 
-        self.size = GAME_CONSTANTS['ENEMY_NINJA_SIZE']
+class MeditatingNinja:
+    '''Define o ninja meditador que aparecerá no jogo'''
+
+    def __init__(self):
+        '''Inicializa a imagem, tamanho e posições do ninja na tela'''
+        self.shape = sprites.get(GAME_CONSTANTS['NINJA_IMAGE'])
 
-        self.speed = GAME_CONSTANTS['ENEMY_NINJA_SPEED']
+        self.size = GAME_CONSTANTS['NINJA_SIZE']
 
-        init_position = GAME_CONSTANTS['ENEMY_NINJA_POSITION']
-        self.position = init_position[0] if side == 'RIGHT' else init_position[1]
+        self.position = GAME_CONSTANTS['NINJA_POSITION']
 
     def render(self, display):
-        '''Fornece um ninjas inimigo em uma determinada exibição de pygame'''
+        '''Proporciona a ninja meditadora em uma determinada tela de pygame'''
         display.blit(self.shape, self.position)
 
-    def update_position(self):
-        '''
-        Em cada quadro, o ninja inimigo moverá sua velocidade em pixels em direção 
-        o centro da tela.
-        Adicionar à coordenada x significa ir para a direção correta.
-        Subtrair da coordenada x significa ir para a direção esquerda.
-        '''
-        if self.side == 'RIGHT':
-            self.position = self.position[0] - self.speed, self.position[1]
-
-        if self.side == 'LEFT':
-            self.position = self.position[0] + self.speed, self.position[1]
-
 
 class Panel:
     '''
@@ -179,24 +190,25 @@ class Panel:
     Ele trata principalmente da exibição de informações para o usuário.
     '''
 
-    def __init__(self, is_easy):
+    def __init__(self, is_easy, rng=random):
         '''
         Inicializa todos os atributos que serão mostrados na tela:
         pergunta matemática, pontuação do jogador, contagem shuriken.
+
+        Args:
+            is_easy (bool): se a dificuldade do jogo é fácil ou não
+            rng (random.Random): gerador de números aleatórios das perguntas
         '''
         self.is_easy = is_easy
 
-        self.math_question = Question(is_easy)
+        self.math_question = Question(is_easy, rng)
 
-        self.math_question_text = render_font(
-            self.math_question.get_string(), font=INTERMEDIATE_FONT
-        )
+        self.math_question_text = question_texts.get(self.math_question.get_string())
 
         self.keyboard_input = ''
 
-        self.keyboard_input_text = render_font(
-            self.keyboard_input, font=INTERMEDIATE_FONT
-        )
+        # Glifos da resposta digitada, com a posição x de cada um
+        self.keyboard_input_glyphs = []
 
         self.text_box = pygame.Surface([100, 40])
         self.text_box.fill([200, 200, 200])
@@ -209,9 +221,15 @@ class Panel:
 
         self.shuriken_count = 0
 
-        self.shuriken_count_text = render_font(
-            str(self.shuriken_count), font=INTERMEDIATE_FONT
-        )
+        self.shuriken_image = sprites.get(GAME_CONSTANTS['PANEL_SHURIKEN_IMAGE'])
+
+        self.compose_shuriken_count()
+
+        # Ação de cada tecla usada pelo painel; as demais teclas são ignoradas sem custo
+        self.key_actions = {key: partial(self.type_character, digit) for key, digit in KEY_DIGITS.items()}
+        self.key_actions[pygame.K_MINUS] = self.type_minus
+        self.key_actions[pygame.K_BACKSPACE] = self.erase_character
+        self.key_actions[pygame.K_RETURN] = self.submit_answer
 
     def render(self, display):
         '''Apresenta o painel inteiro em um determinado display'''
@@ -223,7 +241,9 @@ class Panel:
         '''Apresenta a pergunta matemática em uma determinada tela'''
         display.blit(self.math_question_text, [10, 10])
         display.blit(self.text_box, [10, 40])
-        display.blit(self.keyboard_input_text, [13, 43])
+
+        for glyph, x in self.keyboard_input_glyphs:
+            display.blit(glyph, [13 + x, 43])
 
     def render_score(self, display):
         '''Apresenta a pontuação em uma determinada tela'''
@@ -231,8 +251,10 @@ class Panel:
 
     def render_shuriken_count(self, display):
         '''Fornece a contagem embaralhada em uma determinada tela'''
-        display.blit(GAME_CONSTANTS['PANEL_SHURIKEN_IMAGE'], [470, 15])
-        display.blit(self.shuriken_count_text, [510, 20])
+        display.blit(self.shuriken_image, [470, 15])
+
+        for glyph, x in self.shuriken_count_glyphs:
+            display.blit(glyph, [510 + x, 20])
 
     def add_score(self):
         '''Atualiza a pontuação do jogador, dependendo da dificuldade do jogo'''
@@ -249,44 +271,55 @@ class Panel:
         '''Atualiza a contagem shuriken quando o jogador joga um shuriken'''
         self.shuriken_count -= 1
 
-        self.shuriken_count_text = render_font(
-            str(self.shuriken_count), font=INTERMEDIATE_FONT
-        )
+        self.compose_shuriken_count()
+
+    def compose_keyboard_input(self):
+        '''Monta a resposta digitada a partir dos glifos pré-renderizados, sem renderizar texto'''
+        self.keyboard_input_glyphs = compose_glyphs(self.keyboard_input)
+
+    def compose_shuriken_count(self):
+        '''Monta a contagem de shurikens a partir dos glifos pré-renderizados, sem renderizar texto'''
+        self.shuriken_count_glyphs = compose_glyphs(str(self.shuriken_count))
 
     def process_keyboard(self, key):
         '''Entrada de teclado processada (resposta de digitação do jogador)'''
-        key_pressed = pygame.key.name(key)
+        action = self.key_actions.get(key)
 
-        if key_pressed in '0123456789':
-            self.keyboard_input += key_pressed
+        if action is not None:
+            action()
 
-        else:
-            if key == pygame.K_MINUS:
-                self.keyboard_input += '-' if len(
-                    self.keyboard_input) == 0 else ''
+    def type_character(self, character):
+        '''Acrescenta um dígito à resposta digitada'''
+        self.keyboard_input += character
+        self.compose_keyboard_input()
 
-            if key == pygame.K_RETURN:
-                if len(self.keyboard_input) <= 0 or self.keyboard_input == '-':
-                    return
+    def type_minus(self):
+        '''Acrescenta o sinal de menos, somente no início da resposta'''
+        if len(self.keyboard_input) == 0:
+            self.type_character('-')
 
-                if self.math_question.try_answer(self.keyboard_input):
-                    self.shuriken_count += 1
-                    self.math_question.new_question()
+    def erase_character(self):
+        '''Apaga o último caractere da resposta digitada'''
+        self.keyboard_input = self.keyboard_input[:-1]
+        self.compose_keyboard_input()
 
-                self.keyboard_input = ''
+    def submit_answer(self):
+        '''
+        Confere a resposta digitada. Se estiver certa, o jogador ganha um
+        shuriken e uma nova pergunta é sorteada. A resposta é apagada de qualquer forma.
+        '''
+        if len(self.keyboard_input) <= 0 or self.keyboard_input == '-':
+            return
 
-            if key == pygame.K_BACKSPACE:
-                self.keyboard_input = self.keyboard_input[:-1]
+        if self.math_question.try_answer(self.keyboard_input):
+            self.shuriken_count += 1
+            self.math_question.new_question()
 
-        self.math_question_text = render_font(
-            self.math_question.get_string(), font=INTERMEDIATE_FONT
-        )
-        self.keyboard_input_text = render_font(
-            self.keyboard_input, font=INTERMEDIATE_FONT
-        )
-        self.shuriken_count_text = render_font(
-            str(self.shuriken_count), font=INTERMEDIATE_FONT
-        )
+            self.math_question_text = question_texts.get(self.math_question.get_string())
+            self.compose_shuriken_count()
+
+        self.keyboard_input = ''
+        self.compose_keyboard_input()
 
 
 class ShurikenController:
@@ -297,39 +330,60 @@ class ShurikenController:
 
     def __init__(self, panel):
         ''' 
-        Inicializa uma matriz para armazenar todos os shurikens que aparecem
+        Inicializa um EntityStore para armazenar todos os shurikens que aparecem
         na tela, e um atributo de painel para modificar o painel que
         aparece na parte superior da tela do jogo. 
 
         Args:
             panel (Panel): panel to be updated  '''
 
-        self.rendered_shurikens = []
+        self.shurikens = EntityStore(GAME_CONSTANTS['SHURIKEN_CAPACITY'])
+
+        self.shape = sprites.get(GAME_CONSTANTS['SHURIKEN_IMAGE'])
 
         self.panel = panel
 
     def render(self, display):
-        '''Apresenta a cada shuriken em uma determinada tela e atualiza suas posições'''
-        for shuriken in self.rendered_shurikens:
-            shuriken.render(display)
-            shuriken.update_position()
+        '''Apresenta todos os shurikens em uma determinada tela, com uma única chamada a blits'''
+        shape = self.shape
+
+        display.blits([(shape, position) for position in self.shurikens.positions()], doreturn=False)
+
+    def update(self):
+        '''
+        Avança um passo da simulação, movendo todos os shurikens de uma vez.
+        Em cada passo, o shuriken moverá sua velocidade em pixels para sua direção.
+        Shurikens que saíram da tela são descartados.
+        '''
+        self.shurikens.step()
+        self.shurikens.cull(GAME_CONSTANTS['SCREEN_WIDTH'])
+
+    def throw(self, direction):
+        '''
+        Adiciona um shuriken na posição inicial de uma direção.
+
+        Args:
+            direction (string): "RIGHT" ou "LEFT"
+        '''
+        init_position = GAME_CONSTANTS['SHURIKEN_POSITION']
+        speed = GAME_CONSTANTS['SHURIKEN_SPEED']
+
+        if direction == 'RIGHT':
+            self.shurikens.spawn(init_position[0], speed, RIGHT, GAME_CONSTANTS['SHURIKEN_SIZE'])
+        else:
+            self.shurikens.spawn(init_position[1], -speed, LEFT, GAME_CONSTANTS['SHURIKEN_SIZE'])
 
     def process_keyboard(self, key):
         '''Processa toques de tecla para atirar shurikens'''
-        if self.panel.shuriken_count <= 0:
-            return
-
-        if key == pygame.K_LEFT:
-            self.rendered_shurikens.append(Shuriken(direction='LEFT'))
-            self.panel.spend_shuriken()
+        direction = KEY_DIRECTIONS.get(key)
 
-            pygame.mixer.Sound.play(GAME_CONSTANTS['SHURIKEN_SOUND'])
+        if direction is None or self.panel.shuriken_count <= 0:
+            return
 
-        if key == pygame.K_RIGHT:
-            self.rendered_shurikens.append(Shuriken(direction='RIGHT'))
-            self.panel.spend_shuriken()
+        self.throw(direction)
+        self.panel.spend_shuriken()
 
-            pygame.mixer.Sound.play(GAME_CONSTANTS['SHURIKEN_SOUND'])
+        audio.play_effect('shuriken', GAME_CONSTANTS['SHURIKEN_SOUND'])
 
 
 class EnemyNinjaController:
@@ -338,100 +392,250 @@ class EnemyNinjaController:
     Ele é responsável pela renderização e desova dos ninjas inimigos.
     '''
 
-    def __init__(self, spawn_time):
+    def __init__(self, spawn_time, rng=random):
         '''
-        Inicializa uma matriz para armazenar todos os ninjas inimigos que aparecem em 
-        tela. Um evento de pygame é definido para ser acionado entre iguais
-        intervalos de tempo em milissegundos (spawn_time). Este evento 
-        é tratado no circuito principal do jogo, chamando de spawn_enemy_ninjas.
+        Inicializa um EntityStore para armazenar todos os ninjas inimigos que aparecem em 
+        tela. Um ninja é desovado a cada spawn_time milissegundos de tempo
+        simulado, contados por advance_spawn_timer a cada passo do jogo.
+
+        Args:
+            spawn_time (int): intervalo entre inimigos em milissegundos
+            rng (random.Random): gerador de números aleatórios que escolhe o lado de cada ninja
         '''
-        self.rendered_enemy_ninjas = []
+        self.rng = rng
+
+        self.enemy_ninjas = EntityStore(GAME_CONSTANTS['ENEMY_NINJA_CAPACITY'])
 
-        pygame.time.set_timer(pygame.USEREVENT, spawn_time)
+        # Imagens indexadas pelo lado (RIGHT, LEFT), compartilhadas pelo cache de sprites
+        self.shapes = [sprites.get(image) for image in GAME_CONSTANTS['ENEMY_NINJA_IMAGE']]
+
+        self.spawn_time = spawn_time
+        self.elapsed_time = 0
 
     def render(self, display):
-        '''Apresenta cada ninja inimigo em uma determinada tela e atualiza suas posições'''
-        for enemy_ninja in self.rendered_enemy_ninjas:
-            enemy_ninja.render(display)
-            enemy_ninja.update_position()
+        '''Apresenta todos os ninjas inimigos em uma determinada tela, com uma única chamada a blits'''
+        shapes = self.shapes
+        sides = self.enemy_ninjas.side[:len(self.enemy_ninjas)].tolist()
+
+        display.blits([(shapes[side], position) for position, side in zip(self.enemy_ninjas.positions(), sides)], doreturn=False)
+
+    def update(self):
+        '''
+        Avança um passo da simulação, movendo todos os ninjas inimigos de uma vez
+        em direção ao centro da tela. Ninjas que atravessaram a tela são descartados.
+        '''
+        self.enemy_ninjas.step()
+        self.enemy_ninjas.cull(GAME_CONSTANTS['SCREEN_WIDTH'])
+
+    def advance_spawn_timer(self, elapsed_ms):
+        '''
+        Acumula o tempo simulado e desova um ninja a cada spawn_time milissegundos.
+
+        Args:
+            elapsed_ms (float): tempo simulado desde a última chamada
+        '''
+        self.elapsed_time += elapsed_ms
+
+        while self.elapsed_time >= self.spawn_time:
+            self.elapsed_time -= self.spawn_time
+            self.spawn_enemy_ninjas()
+
+    def spawn(self, side):
+        '''
+        Adiciona um ninja inimigo na posição inicial de um lado.
+
+        Args:
+            side (string): "RIGHT" ou "LEFT"
+        '''
+        init_position = GAME_CONSTANTS['ENEMY_NINJA_POSITION']
+        speed = GAME_CONSTANTS['ENEMY_NINJA_SPEED']
+
+        if side == 'RIGHT':
+            self.enemy_ninjas.spawn(init_position[0], -speed, RIGHT, GAME_CONSTANTS['ENEMY_NINJA_SIZE'])
+        else:
+            self.enemy_ninjas.spawn(init_position[1], speed, LEFT, GAME_CONSTANTS['ENEMY_NINJA_SIZE'])
 
     def spawn_enemy_ninjas(self):
         '''Escolha aleatoriamente um lado para o ninja e adicione-o ao conjunto.'''
-        side = random.choice(['RIGHT', 'LEFT'])
-        self.rendered_enemy_ninjas.append(EnemyNinja(side=side))
+        self.spawn(self.rng.choice(['RIGHT', 'LEFT']))
+
+
+class InputRecorder:
+    '''
+    Grava as teclas pressionadas em uma partida, junto com a semente do
+    gerador aleatório, para que a partida possa ser repetida (ver replay.py).
+    Cada tecla é marcada com o passo de simulação em que foi aplicada e com
+    o tempo real, em milissegundos, desde o início da partida.
+    '''
+
+    def __init__(self, seed, is_easy, name=''):
+        '''
+        Args:
+            seed (int): semente do gerador aleatório da partida
+            is_easy (bool): dificuldade do jogo
+            name (string): nome do jogador
+        '''
+        self.seed = seed
+        self.is_easy = is_easy
+        self.name = name
+
+        self.events = []
+
+        self.start_time = pygame.time.get_ticks()
+
+    def record(self, step, key):
+        '''Registra uma tecla aplicada antes do passo de simulação indicado'''
+        self.events.append([step, pygame.time.get_ticks() - self.start_time, key])
+
+    def save(self, directory, steps, score):
+        '''
+        Salva a gravação em um arquivo JSON novo dentro de directory.
+
+        Args:
+            steps (int): número de passos simulados na partida
+            score (int): pontuação final, usada para conferir o replay
+
+        Returns: caminho do arquivo criado
+        '''
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.name or 'anonimo'}.json")
+
+        with open(path, 'w') as f:
+            json.dump({
+                'seed': self.seed,
+                'is_easy': self.is_easy,
+                'name': self.name,
+                'steps': steps,
+                'score': score,
+                'events': self.events,
+            }, f)
+
+        return path
 
 
 class CollisionController:
     '''
     Define um controlador para todas as colisões que possam acontecer no jogo.
     Dependendo de quais agentes colidiram, uma ação diferente é tomada.
+    Uma colisão é detectada quando a coordenada x do centro de um corpo
+    está entre os lados do outro. y-coordenadas não são
+    considerado porque não há necessidade disso no jogo.
     '''
 
-    def __init__(self, meditating_ninja, shuriken_control, enemy_ninja_control, panel, gameover_action):
-        '''Armazena todas as entidades do jogo para acessar suas propriedades dentro da classe'''
+    def __init__(self, meditating_ninja, shuriken_control, enemy_ninja_control, panel, gameover_action, gameover_steps=0):
+        '''
+        Armazena todas as entidades do jogo para acessar suas propriedades dentro da classe
+
+        Args:
+            gameover_steps (int): passos de simulação entre a colisão que acaba o jogo
+                e a chamada de gameover_action, enquanto o gongo toca
+        '''
         self.meditating_ninja = meditating_ninja
         self.shuriken_control = shuriken_control
         self.enemy_ninja_control = enemy_ninja_control
         self.panel = panel
         self.gameover_halt = gameover_action
+        self.gameover_steps = gameover_steps
 
-    def __detect_collision(self, A, B):
-        '''
-        Função que detecta a colisão entre dois corpos.
-        Uma colisão é detectada quando a coordenada x de um corpo
-        está entre os lados do outro. y-coordenadas não são
-        considerado porque não há necessidade disso no jogo.
-
-        Args: Dois corpos com uma propriedade de posição x-y (na forma de uma lista)
-
-        Returns: bool representando a colisão dos corpos
-        '''
-        A_middle_x = A.position[0] + (A.size[0] // 2)
-
-        B_front_x = B.position[0]
-        B_back_x = B.position[0] + B.size[0]
+        self.gameover_countdown = None  # Passos restantes do fim de jogo; None enquanto o jogo continua
 
-        if A_middle_x >= B_front_x and A_middle_x <= B_back_x:
-            return True
+        self.gameover_enabled = True  # Desligado somente em testes de carga (ver stress.py)
 
-        return False
+    @property
+    def is_gameover(self):
+        '''Returns: verdadeiro depois que um inimigo alcançou o ninja meditante'''
+        return self.gameover_countdown is not None
 
     def detect_gameover(self):
         '''
-        Verifica se há colisões entre todos os inimigos e o ninja meditante.
-        Se uma colisão tiver ocorrido, chama-se jogo sobre procedimento.
+        Verifica de uma vez se algum inimigo colidiu com o ninja meditante.
+        Se uma colisão tiver ocorrido, chama-se jogo sobre procedimento,
+        uma única vez, mesmo que outros inimigos o alcancem depois.
         '''
-        for enemy_ninja in self.enemy_ninja_control.rendered_enemy_ninjas:
-            if self.__detect_collision(enemy_ninja, self.meditating_ninja):
-                self.on_gameover_detected()
+        if self.is_gameover or not self.gameover_enabled or not len(self.enemy_ninja_control.enemy_ninjas):
+            return
+
+        middles = self.enemy_ninja_control.enemy_ninjas.middles()
+
+        front_x = self.meditating_ninja.position[0]
+        back_x = front_x + self.meditating_ninja.size[0]
+
+        if np.any((middles >= front_x) & (middles <= back_x)):
+            self.on_gameover_detected()
 
     def on_gameover_detected(self):
         '''
-        Pára a música do jogo e toca um efeito sonoro. Congela
-        a tela e chama um procedimento para interromper a execução do jogo.
+        Pára a música do jogo e toca um efeito sonoro. A partir daqui o jogo
+        fica no estado de fim de jogo por gameover_steps passos (ver advance_gameover),
+        sem bloquear o laço de quadros, e então a execução é interrompida.
         '''
-        pygame.mixer.music.stop()
-        pygame.mixer.Sound.play(GAME_CONSTANTS['GONG_SOUND'])
+        audio.stop_music()
+        audio.play_effect('gong', GAME_CONSTANTS['GONG_SOUND'])
+
+        self.gameover_countdown = self.gameover_steps
+
+        if not self.gameover_countdown:
+            self.gameover_halt()
+
+    def advance_gameover(self):
+        '''Conta um passo do fim de jogo e interrompe a execução quando a contagem termina'''
+        if not self.gameover_countdown:
+            return
 
-        time.sleep(2)
+        self.gameover_countdown -= 1
 
-        self.gameover_halt()
+        if not self.gameover_countdown:
+            self.gameover_halt()
 
     def detect_player_scored(self):
         '''
         Verificações de colisões entre todos os shurikens e todos os ninjas inimigos.
-        Se uma colisão tiver ocorrido, um procedimento é chamado para aumentar a pontuação.
-        '''
-        for shuriken in self.shuriken_control.rendered_shurikens:
-            for enemy_ninja in self.enemy_ninja_control.rendered_enemy_ninjas:
-                if self.__detect_collision(shuriken, enemy_ninja):
-                    self.on_score(shuriken, enemy_ninja)
-
-    def on_score(self, shuriken, enemy_ninja):
-        '''Remove o ninja inimigo e o shuriken que colidiu da tela, e aumenta a pontuação'''
-        self.enemy_ninja_control.rendered_enemy_ninjas.remove(enemy_ninja)
-        self.shuriken_control.rendered_shurikens.remove(shuriken)
-        self.panel.add_score()
+        Os ninjas são ordenados pela frente (coordenada x) e o centro de cada shuriken
+        é procurado nessa ordem com uma busca binária vetorizada. Como todos os ninjas
+        têm a mesma largura, o último ninja que começa antes do centro do shuriken
+        é o único candidato a colisão.
+        Cada ninja é derrubado por no máximo um shuriken. Se houver colisões,
+        um procedimento é chamado para aumentar a pontuação.
+        '''
+        shurikens = self.shuriken_control.shurikens
+        enemy_ninjas = self.enemy_ninja_control.enemy_ninjas
+
+        if not len(shurikens) or not len(enemy_ninjas):
+            return
+
+        middles = shurikens.middles()
+
+        order = np.argsort(enemy_ninjas.x[:len(enemy_ninjas)], kind='stable')
+        fronts = enemy_ninjas.x[order]
+        backs = fronts + enemy_ninjas.width[order]
+
+        candidates = np.searchsorted(fronts, middles, side='right') - 1
+        hit_shurikens = np.flatnonzero(candidates >= 0)
+        hit_shurikens = hit_shurikens[backs[candidates[hit_shurikens]] >= middles[hit_shurikens]]
+
+        if not len(hit_shurikens):
+            return
+
+        # Se vários shurikens atingem o mesmo ninja, somente o primeiro conta
+        hit_enemy_ninjas, first = np.unique(order[candidates[hit_shurikens]], return_index=True)
+
+        self.on_score(hit_shurikens[first], hit_enemy_ninjas)
+
+    def on_score(self, shuriken_indices, enemy_ninja_indices):
+        '''
+        Remove de uma só vez os ninjas inimigos e os shurikens que colidiram
+        da tela, e aumenta a pontuação uma vez por colisão.
+
+        Args:
+            shuriken_indices (array): índices dos shurikens que colidiram
+            enemy_ninja_indices (array): índices dos ninjas inimigos atingidos
+        '''
+        self.shuriken_control.shurikens.remove(shuriken_indices)
+        self.enemy_ninja_control.enemy_ninjas.remove(enemy_ninja_indices)
+
+        for _ in range(len(enemy_ninja_indices)):
+            self.panel.add_score()
 
     def scan_for_collisions(self):
         '''Verificações para todos os tipos de colisões'''
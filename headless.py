@@ -0,0 +1,98 @@
+'''
+Executa o jogo sem janela e sem dispositivo de áudio. A lógica do jogo
+é avançada por chamadas explícitas a Game.tick, sem limite de quadros
+por segundo, o que permite testes automáticos e testes de carga.
+
+Uso:
+    python headless.py [--easy] [--ticks N] [--idle] [--seed N]
+'''
+import offscreen  # Escolhe os drivers "dummy" do SDL; precisa vir antes do pygame
+import argparse
+import time
+import numpy as np
+import pygame
+from entity_store import RIGHT
+from game import HardGame, EasyGame
+
+pygame.init()
+
+
+def autopilot_keys(game):
+    '''
+    Jogador automático simples: responde à pergunta quando não há
+    shurikens e lança um shuriken na direção do inimigo mais próximo.
+
+    Args:
+        game (Game): jogo sendo simulado
+
+    Returns:
+        list: códigos de teclas a serem pressionadas neste passo
+    '''
+    panel = game.panel
+
+    if panel.shuriken_count <= 0:
+        answer = str(panel.math_question.answer)
+        keys = [pygame.K_MINUS if char == '-' else pygame.K_0 + int(char) for char in answer]
+
+        return keys + [pygame.K_RETURN]
+
+    enemy_ninjas = game.enemy_ninja_controller.enemy_ninjas
+
+    if not len(enemy_ninjas):
+        return []
+
+    center = game.meditating_ninja.position[0] + game.meditating_ninja.size[0] // 2
+    closest = int(np.argmin(np.abs(enemy_ninjas.middles() - center)))
+
+    return [pygame.K_RIGHT if enemy_ninjas.side[closest] == RIGHT else pygame.K_LEFT]
+
+
+def run_headless(ticks, is_easy=False, player=autopilot_keys, seed=None):
+    '''
+    Avança um jogo sem janela por um número de passos, ou até o fim do jogo.
+
+    Args:
+        ticks (int): número máximo de passos de simulação
+        is_easy (bool): dificuldade do jogo
+        player (callable): recebe o jogo e retorna as teclas de cada passo,
+            ou None para não pressionar nenhuma tecla
+        seed (int): semente do gerador aleatório da partida, opcional
+
+    Returns:
+        dict: passos executados, tempo gasto, passos por segundo e pontuação
+    '''
+    game_class = EasyGame if is_easy else HardGame
+    game = game_class(headless=True, seed=seed)
+
+    start = time.perf_counter()
+    executed = 0
+
+    while game.run and executed < ticks:
+        game.tick(player(game) if player else ())
+        executed += 1
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        'ticks': executed,
+        'seconds': elapsed,
+        'ticks_per_second': executed / elapsed if elapsed > 0 else float('inf'),
+        'score': game.panel.score,
+        'game_over': not game.run,
+        'seed': game.seed,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Executa o jogo sem janela')
+    parser.add_argument('--easy', action='store_true', help='usa a dificuldade fácil')
+    parser.add_argument('--ticks', type=int, default=10000, help='número máximo de passos')
+    parser.add_argument('--idle', action='store_true', help='não pressiona nenhuma tecla')
+    parser.add_argument('--seed', type=int, help='semente do gerador aleatório')
+    args = parser.parse_args()
+
+    result = run_headless(args.ticks, is_easy=args.easy, player=None if args.idle else autopilot_keys, seed=args.seed)
+
+    print(f"{result['ticks']} passos em {result['seconds']:.3f}s "
+          f"({result['ticks_per_second']:.0f} passos/s), pontuação {result['score']}, "
+          f"fim de jogo: {'sim' if result['game_over'] else 'não'}, semente {result['seed']}")
@@ -1,6 +1,6 @@
 import pygame
-from constants import MEDIUM_FONT, SCREEN_NAMES, HIGH_SCORES_CONSTANTS
-from utils import render_font, Ranking, Screen
+from constants import MEDIUM_FONT, SCREEN_NAMES, HIGH_SCORES_CONSTANTS, ranking_writer
+from utils import render_font, Screen
 
 
 class HighScores(Screen):
@@ -10,34 +10,62 @@ class HighScores(Screen):
     render_frame uma vez.
     '''
 
+    reusable = True
+
     def __init__(self, name=''):
         '''
-        Inicializa os atributos da classe mãe, cria um Ranking
-        objeto para lidar com o arquivo de texto de alta pontuação, e cria
-        duas listas paralelas para armazenar as altas pontuações atuais.
+        Inicializa os atributos da classe mãe e cria duas listas paralelas
+        para armazenar as altas pontuações atuais, publicadas pela thread
+        que grava o ranking (ver RankingWriter em utils.py).
 
         Args:
             name (string): nome do jogador, opcional
         '''
         super().__init__(name)
 
-        self.ranking = Ranking('high_scores.txt')
+        self.leaderboard_version = None
 
         self.names = []
         self.scores = []
 
-        score = self.ranking.get_players()
+        ranking_writer.refresh()
+        self.load_leaderboard()
+
+    def reset(self, name=''):
+        '''Reabre a tela, pedindo à thread do ranking que confira se o arquivo mudou'''
+        super().reset(name)
+
+        ranking_writer.refresh()
+        self.load_leaderboard()
+
+    def load_leaderboard(self):
+        '''
+        Renderiza as 10 maiores pontuações publicadas pela thread do ranking, se mudaram
+        desde a última vez. Não lê o arquivo nem espera pela thread: se as pontuações
+        ainda não foram publicadas, a tela é atualizada quando forem.
+        '''
+        version, top = ranking_writer.leaderboard
+
+        if version == self.leaderboard_version:
+            return
+
+        self.leaderboard_version = version
 
-        for name in self.ranking.get_leaderboard()[:10]:
+        self.names = []
+        self.scores = []
+
+        for name, score in top:
             self.names.append(
                 render_font(name, font=MEDIUM_FONT, color=[0, 0, 255])
             )
 
             self.scores.append(
-                render_font(str(score[name]),
+                render_font(str(score),
                             font=MEDIUM_FONT, color=[0, 0, 255])
             )
 
+        self.invalidate()
+
     def render_frame(self):
         '''Apresenta um quadro da tela de alta pontuação em uma tela de jogos pygame'''
         for event in pygame.event.get():
@@ -49,16 +77,23 @@ class HighScores(Screen):
                     self.set_next_screen(SCREEN_NAMES[0])
                     self.stop_running()
 
+            if event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
+
+        self.load_leaderboard()
+
+        self.redraw()
+
+    def draw(self):
+        '''Desenha a tela de alta pontuação inteira. Só é chamada no primeiro quadro e quando as pontuações mudam'''
         self.screen.fill([255, 184, 122])
 
         self.screen.blit(HIGH_SCORES_CONSTANTS['TITLE'], [10, 10])
 
         self.screen.blit(HIGH_SCORES_CONSTANTS['SUBTITLE'], [10, 50])
 
-        for i in range(10):  # Apresenta cada pontuação alta com uma margem de 25px
-            self.screen.blit(self.names[i], [180, 25 * i + 90])
-            self.screen.blit(self.scores[i], [360, 25 * i + 90])
+        for i, (name, score) in enumerate(zip(self.names, self.scores)):  # Apresenta cada pontuação alta com uma margem de 25px
+            self.screen.blit(name, [180, 25 * i + 90])
+            self.screen.blit(score, [360, 25 * i + 90])
 
         self.screen.blit(HIGH_SCORES_CONSTANTS['BACK'], [180, 360])
-
-        pygame.display.update()
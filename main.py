@@ -1,5 +1,5 @@
 import pygame
-from constants import SCREEN_NAMES
+from constants import SCREEN_NAMES, FRAME_RATE, MUSIC_TRACKS, audio, ranking_writer
 from menu import Menu
 from game import HardGame, EasyGame
 from rules import Rules
@@ -14,32 +14,84 @@ screens = dict(
 clock = pygame.time.Clock()
 
 
+class ScreenManager:
+    '''
+    Máquina de estados das telas. Abre uma tela por vez em um laço, sem
+    recursão, então a pilha e a memória não crescem com o número de trocas.
+    Telas marcadas como reutilizáveis são criadas uma vez e reabertas.
+    '''
+
+    def __init__(self, screens):
+        '''
+        Args:
+            screens (dict): mapeia o nome de cada tela para sua classe
+        '''
+        self.screens = screens
+
+        self.cache = {}
+
+    def open(self, screen_name, name=''):
+        '''
+        Args:
+            screen_name (string): nome da tela a ser aberta.
+            name (string): nome do jogador, opcional.
+
+        Returns:
+            Screen: tela pronta para executar, nova ou reaproveitada
+        '''
+        screen_class = self.screens[screen_name]
+
+        if not screen_class.reusable:
+            return screen_class(name)
+
+        if screen_name not in self.cache:
+            self.cache[screen_name] = screen_class(name)
+        else:
+            self.cache[screen_name].reset(name)
+
+        return self.cache[screen_name]
+
+    def run(self, screen_name, name=''):
+        '''
+        Executa telas até que uma delas termine sem uma próxima tela
+        configurada, e então fecha o pygame.
+
+        Args:
+            screen_name (string): nome da primeira tela.
+            name (string): nome do jogador, opcional.
+        '''
+        while screen_name in self.screens:
+            active_screen = self.open(screen_name, name)
+
+            while active_screen.run:
+                clock.tick(FRAME_RATE)
+                active_screen.render_frame()
+
+            screen_name, name = active_screen.next_screen, active_screen.name
+
+        pygame.quit()
+
+
 def open_window(screen, name=None):
     '''
     A função abre a tela indicada nos parâmetros e inicializa
-    a tela com um nome salvo, se houver algum. Quando a tela é 
+    a tela com um nome salvo, se houver algum. Quando a tela é
     fechado, uma nova tela é aberta se houver uma próxima_tela configurada.
 
-    Args: 
+    Args:
         screen (string): nome da tela a ser aberta.
         name (string): nome do jogador, opcional.
 
     '''
-    active_screen = screens[screen](name) if name else screens[screen]()
-
-    while active_screen.run:
-        clock.tick(60)
-        active_screen.render_frame()
-
-    try:
-        open_window(active_screen.next_screen, name=active_screen.name)
-    except KeyError:
-        pygame.quit()
+    ScreenManager(screens).run(screen, name or '')
 
 
 if __name__ == '__main__':
-    # Carrega e toca música do menu principal
-    pygame.mixer.music.load('music/music_calm.wav')
-    pygame.mixer.music.play(-1)
+    # Carrega as músicas em segundo plano; a do menu começa assim que estiver pronta
+    audio.preload_music(MUSIC_TRACKS)
+    audio.play_music('calm')
+
+    # Lê o ranking em segundo plano, antes que a tela de alta pontuação seja aberta
+    ranking_writer.refresh()
 
     open_window(SCREEN_NAMES[0])  # Abre a tela zero (menu)
@@ -1,8 +1,13 @@
 import pygame
 from utils import render_font, Screen
-from constants import MEDIUM_FONT, SCREEN_NAMES, MENU_CONSTANTS
+from constants import MEDIUM_FONT, SCREEN_NAMES, MENU_CONSTANTS, sprites
+from game_utils import question_texts
+from functools import partial
 from string import ascii_lowercase
 
+# Letras que podem ser digitadas no nome, indexadas pelo código da tecla
+KEY_LETTERS = {pygame.K_a + i: letter.upper() for i, letter in enumerate(ascii_lowercase)}
+
 
 class Button():
     '''
@@ -27,6 +32,9 @@ class Button():
         self.box = pygame.Surface([200, 40])
         self.box.fill([255, 255, 255])
 
+        # Região ocupada pelo botão na tela, usada para redesenhá-lo
+        self.rect = pygame.Rect(position[0] - 5, position[1] - 5, 200, 40)
+
         self.active = False
 
     def toggle_active(self):
@@ -52,6 +60,14 @@ class Menu(Screen):
     processamento, exceto o construtor.
     '''
 
+    NAME_BOX_RECT = pygame.Rect(220, 70, 250, 40)
+    NAME_POSITION = (225, 80)  # Nomes longos passam da caixa, então o nome tem sua própria região
+
+    # Tempo de cada quadro do menu usado para preparar os textos do jogo
+    WARM_UP_BUDGET_MS = 4
+
+    reusable = True
+
     def __init__(self, name=''):
         '''
         Salva o atributo de imagem ninja, adiciona todos os botões a uma lista 
@@ -62,7 +78,7 @@ class Menu(Screen):
         '''
         super().__init__(name)
 
-        self.ninja_image = MENU_CONSTANTS['NINJA_IMAGE'].convert_alpha()
+        self.ninja_image = sprites.get(MENU_CONSTANTS['NINJA_IMAGE'])
 
         self.buttons = []
         self.buttons.append(Button(text='PLAY [EASY]', position=[10, 180]))
@@ -73,48 +89,75 @@ class Menu(Screen):
         self.active_button = 0
         self.buttons[self.active_button].toggle_active()
 
-    def process_arrow_pressed(self, key):
+        # Ação de cada tecla usada pelo menu
+        self.key_actions = {key: partial(self.type_letter, letter) for key, letter in KEY_LETTERS.items()}
+        self.key_actions[pygame.K_BACKSPACE] = self.erase_letter
+        self.key_actions[pygame.K_UP] = partial(self.move_selection, -1)
+        self.key_actions[pygame.K_DOWN] = partial(self.move_selection, 1)
+        self.key_actions[pygame.K_RETURN] = self.process_navigation_action
+
+    def reset(self, name=''):
+        '''Reabre o menu com o primeiro botão ativo, como se fosse um menu novo'''
+        super().reset(name)
+
+        self.buttons[self.active_button].toggle_active()
+        self.active_button = 0
+        self.buttons[self.active_button].toggle_active()
+
+    def move_selection(self, step):
         '''
         Quando o usuário pressiona a seta para cima ou para baixo, o botão ativo muda.
         A função desativa o botão antigo, e ativa o novo.
-        '''
-        if key == pygame.K_UP and self.active_button > 0:
-            self.buttons[self.active_button].toggle_active()
-            self.active_button -= 1  # Mudanças ativas para o botão abaixo
-            self.buttons[self.active_button].toggle_active()
-
-        if key == pygame.K_DOWN and self.active_button < len(self.buttons) - 1:
-            self.buttons[self.active_button].toggle_active()
-            self.active_button += 1  # Mudanças ativas para o botão acima
-            self.buttons[self.active_button].toggle_active()
 
-    def process_navigation_action(self, key):
+        Args:
+            step (int): -1 para o botão de cima, 1 para o de baixo
+        '''
+        if 0 <= self.active_button + step < len(self.buttons):
+            self.toggle_button()
+            self.active_button += step
+            self.toggle_button()
+
+    def toggle_button(self):
+        '''Inverte o estado do botão ativo e marca sua região para ser redesenhada'''
+        button = self.buttons[self.active_button]
+        button.toggle_active()
+        self.invalidate(button.rect)
+
+    def process_navigation_action(self):
         '''
         Quando o usuário pressiona para voltar, é definido um redirecionamento que 
         será usado pelo código principal para mudar as telas, e
         o menu deixa de funcionar.
         '''
-        if key == pygame.K_RETURN:
-            next_screen = SCREEN_NAMES[self.active_button + 1]
+        next_screen = SCREEN_NAMES[self.active_button + 1]
 
-            if len(self.name) < 1 and next_screen in ['hard_game', 'easy_game']:
-                return
+        if len(self.name) < 1 and next_screen in ['hard_game', 'easy_game']:
+            return
 
-            self.set_next_screen(next_screen)
-            self.stop_running()
+        self.set_next_screen(next_screen)
+        self.stop_running()
 
-    def process_typing_name(self, key):
-        '''Muda o atributo do nome quando uma letra ou a tecla de backspace é pressionada.'''
-        if key == pygame.K_BACKSPACE:
-            self.name = self.name[:-1]
+    def type_letter(self, letter):
+        '''Acrescenta uma letra ao nome, se ainda couber'''
+        if len(self.name) <= 10:
+            self.change_name(self.name + letter)
 
-        if len(self.name) > 10:
-            return
+    def erase_letter(self):
+        '''Apaga a última letra do nome'''
+        if self.name:
+            self.change_name(self.name[:-1])
 
-        key_name = pygame.key.name(key)
+    def name_rect(self, name):
+        '''Returns: região da tela ocupada por um nome desenhado em NAME_POSITION'''
+        return pygame.Rect(self.NAME_POSITION, MEDIUM_FONT.size(name))
 
-        if key_name in ascii_lowercase:
-            self.name += key_name.upper()
+    def change_name(self, name):
+        '''Troca o nome e marca para ser redesenhada a região do nome antigo e do novo'''
+        old_rect = self.name_rect(self.name)
+
+        self.name = name
+
+        self.invalidate(old_rect.union(self.name_rect(name)))
 
     def render_frame(self):
         '''Apresenta um quadro do menu em uma tela de jogos de pygame'''
@@ -123,23 +166,34 @@ class Menu(Screen):
                 self.stop_running()
 
             if event.type == pygame.KEYDOWN:
-                self.process_arrow_pressed(event.key)
-                self.process_typing_name(event.key)
-                self.process_navigation_action(event.key)
+                action = self.key_actions.get(event.key)
+
+                if action is not None:  # As demais teclas são ignoradas
+                    action()
 
+            if event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
+
+        self.redraw()
+
+        # O menu quase não trabalha: o resto do quadro prepara as perguntas do jogo
+        question_texts.step(self.WARM_UP_BUDGET_MS)
+
+    def draw(self):
+        '''
+        Desenha o menu inteiro. Depois do primeiro quadro, só é chamada com a área de
+        recorte limitada às regiões alteradas (caixa do nome e botões).
+        '''
         self.screen.fill([255, 184, 122])
 
         self.screen.blit(MENU_CONSTANTS['TITLE'], [10, 10])
         self.screen.blit(MENU_CONSTANTS['NAME'], [10, 80])
-        self.screen.blit(MENU_CONSTANTS['NAME_BOX'], [220, 70])
+        self.screen.blit(MENU_CONSTANTS['NAME_BOX'], self.NAME_BOX_RECT)
 
-        self.screen.blit(MEDIUM_FONT.render(
-            self.name, True, [0, 0, 0]), [225, 80])
+        self.screen.blit(render_font(self.name, font=MEDIUM_FONT), self.NAME_POSITION)
 
         self.screen.blit(MENU_CONSTANTS['WARNING'], [210, 115])
         self.screen.blit(self.ninja_image, [290, 202])
 
         for button in self.buttons:
             button.render(self.screen)
-
-        pygame.display.update()
@@ -0,0 +1,9 @@
+'''
+Escolhe os drivers "dummy" do SDL, para rodar o jogo sem janela e sem
+dispositivo de áudio. Deve ser importado antes do pygame, porque os
+drivers precisam ser escolhidos antes da inicialização.
+'''
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,146 @@
+import atexit
+import csv
+import time
+import numpy as np
+
+
+class FrameProfiler:
+    '''
+    Mede quanto tempo cada fase de um quadro leva (eventos, colisões, desenho
+    de cada parte, atualização da tela) e guarda os últimos quadros em um
+    buffer circular de tamanho fixo. Os tempos podem ser vistos ao vivo em
+    uma sobreposição na tela ou gravados em um arquivo CSV ao sair.
+    '''
+
+    # Quadros entre duas atualizações do texto da sobreposição
+    OVERLAY_REFRESH = 15
+
+    def __init__(self, phases, size=600, csv_path=None):
+        '''
+        Args:
+            phases (list): nomes das fases, na ordem em que acontecem no quadro
+            size (int): número de quadros guardados; os mais antigos são sobrescritos
+            csv_path (string): arquivo onde o buffer é gravado ao sair do programa, opcional
+        '''
+        self.phases = list(phases)
+        self.columns = {phase: i for i, phase in enumerate(self.phases)}
+
+        # Uma linha por quadro: duração total do quadro e de cada fase, em milissegundos
+        self.buffer = np.zeros((size, len(self.phases) + 1))
+        self.frames = 0  # Quadros terminados desde o início
+
+        self.current = [0.0] * len(self.phases)
+        self.frame_start = None
+        self.last_mark = time.perf_counter()
+
+        self.overlay = False
+        self.overlay_lines = []
+
+        self.csv_path = csv_path
+
+        if csv_path:
+            atexit.register(self.dump)
+
+    def begin_frame(self):
+        '''Termina o quadro anterior, se houver, e começa a medir um novo'''
+        now = time.perf_counter()
+
+        if self.frame_start is not None:
+            row = self.buffer[self.frames % len(self.buffer)]
+            row[0] = (now - self.frame_start) * 1000
+            row[1:] = self.current
+
+            self.frames += 1
+
+        self.current = [0.0] * len(self.phases)
+        self.frame_start = now
+        self.last_mark = now
+
+    def mark(self, phase):
+        '''
+        Soma à fase o tempo desde a marca anterior. Uma fase pode ser marcada
+        várias vezes no mesmo quadro (por exemplo, uma vez por passo de simulação).
+
+        Args:
+            phase (string): um dos nomes passados ao construtor
+        '''
+        now = time.perf_counter()
+
+        self.current[self.columns[phase]] += (now - self.last_mark) * 1000
+
+        self.last_mark = now
+
+    def recent(self, count=None):
+        '''
+        Args:
+            count (int): número de quadros, opcional; o padrão é o buffer inteiro
+
+        Returns: matriz com os últimos quadros terminados, do mais antigo ao mais recente
+        '''
+        size = len(self.buffer)
+        count = min(count or size, self.frames, size)
+
+        indices = np.arange(self.frames - count, self.frames) % size
+
+        return self.buffer[indices]
+
+    def toggle_overlay(self):
+        '''Mostra ou esconde a sobreposição com FPS e milissegundos por fase'''
+        self.overlay = not self.overlay
+        self.overlay_lines = []
+
+    def render_overlay(self, display, font):
+        '''
+        Desenha a sobreposição, se estiver ativa. O texto usa a média dos
+        últimos quadros e só é renderizado de novo a cada OVERLAY_REFRESH quadros.
+
+        Args:
+            display (pygame.Surface): tela onde a sobreposição é desenhada
+            font (pygame.font.Font): fonte do texto
+        '''
+        if not self.overlay:
+            return
+
+        if not self.overlay_lines or self.frames % self.OVERLAY_REFRESH == 0:
+            self.overlay_lines = self.render_overlay_lines(font)
+
+        x = display.get_width() - max(line.get_width() for line in self.overlay_lines) - 5
+
+        for i, line in enumerate(self.overlay_lines):
+            display.blit(line, [x, 5 + i * font.get_linesize()])
+
+    def render_overlay_lines(self, font):
+        '''Returns: lista de superfícies, uma por linha da sobreposição'''
+        frames = self.recent(self.OVERLAY_REFRESH * 4)
+
+        if len(frames):
+            averages = frames.mean(axis=0)
+            fps = 1000 / averages[0] if averages[0] else 0
+        else:
+            averages = np.zeros(len(self.phases) + 1)
+            fps = 0
+
+        lines = [f'FPS {fps:.0f} ({averages[0]:.2f} ms)']
+        lines += [f'{phase} {ms:.3f} ms' for phase, ms in zip(self.phases, averages[1:])]
+
+        # Renderizado direto, sem cache: os números mudam o tempo todo
+        return [font.render(line, True, [255, 0, 0], [255, 255, 255]) for line in lines]
+
+    def dump(self, path=None):
+        '''
+        Grava os quadros do buffer em um arquivo CSV, do mais antigo ao mais recente.
+
+        Args:
+            path (string): caminho do arquivo, opcional; o padrão é csv_path
+        '''
+        path = path or self.csv_path
+
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms', *[f'{phase}_ms' for phase in self.phases]])
+
+            frames = self.recent()
+            first = self.frames - len(frames)
+
+            for i, row in enumerate(frames):
+                writer.writerow([first + i, *[f'{value:.4f}' for value in row]])
@@ -0,0 +1,97 @@
+'''
+Repete uma partida gravada (ver MEDITATING_DOG_RECORDINGS em constants.py)
+sem janela e mais rápido que o tempo real. A mesma semente e as mesmas teclas
+nos mesmos passos reproduzem a partida exatamente, então a gravação serve como
+teste de regressão e como carga fixa para comparar o custo por quadro entre versões.
+
+Uso:
+    python replay.py gravacao.json [--render]
+'''
+import offscreen  # Escolhe os drivers "dummy" do SDL; precisa vir antes do pygame
+import argparse
+import json
+import sys
+import time
+import pygame
+from game import HardGame, EasyGame
+from utils import percentile
+
+pygame.init()
+
+
+def load_recording(path):
+    '''
+    Returns:
+        dict: gravação com semente, dificuldade, passos, pontuação e teclas
+    '''
+    with open(path) as f:
+        return json.load(f)
+
+
+def replay(recording, render=False):
+    '''
+    Repete uma partida gravada, aplicando cada tecla antes do passo em que
+    ela foi aplicada originalmente.
+
+    Args:
+        recording (dict): gravação carregada por load_recording
+        render (bool): se verdadeiro, desenha cada passo e mede o tempo de quadro
+
+    Returns:
+        dict: passos executados, tempo gasto, pontuação final, se ela confere
+            com a gravação e, com render, os percentis do tempo de quadro em ms
+    '''
+    game_class = EasyGame if recording['is_easy'] else HardGame
+    game = game_class(recording['name'], headless=True, seed=recording['seed'])
+
+    keys_by_step = {}
+
+    for step, _, key in recording['events']:
+        keys_by_step.setdefault(step, []).append(key)
+
+    frame_times = []
+    start = time.perf_counter()
+
+    while game.run and game.step_count < recording['steps']:
+        frame_start = time.perf_counter()
+
+        game.tick(keys_by_step.get(game.step_count, ()))
+
+        if render:
+            game.draw()
+            pygame.display.update()
+            frame_times.append((time.perf_counter() - frame_start) * 1000)
+
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'steps': game.step_count,
+        'seconds': elapsed,
+        'score': game.panel.score,
+        'matches': game.panel.score == recording['score'],
+    }
+
+    if frame_times:
+        frame_times.sort()
+
+        for percent in [50, 95, 99]:
+            result[f'p{percent}'] = percentile(frame_times, percent)
+
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Repete uma partida gravada')
+    parser.add_argument('path', help='arquivo de gravação')
+    parser.add_argument('--render', action='store_true', help='desenha cada passo e mede o tempo de quadro')
+    args = parser.parse_args()
+
+    result = replay(load_recording(args.path), render=args.render)
+
+    print(f"{result['steps']} passos em {result['seconds']:.3f}s, pontuação {result['score']} "
+          f"({'confere' if result['matches'] else 'NÃO confere'} com a gravação)")
+
+    if 'p50' in result:
+        print(f"tempo de quadro: p50 {result['p50']:.3f}ms, p95 {result['p95']:.3f}ms, p99 {result['p99']:.3f}ms")
+
+    sys.exit(0 if result['matches'] else 1)
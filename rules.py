@@ -10,6 +10,8 @@ class Rules(Screen):
     função render_frame uma vez.
     '''
 
+    reusable = True
+
     def __init__(self, name=''):
         '''
         Chama a construtora da classe mãe para herdar
@@ -31,6 +33,13 @@ class Rules(Screen):
                     self.set_next_screen(SCREEN_NAMES[0])
                     self.stop_running()
 
+            if event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
+
+        self.redraw()
+
+    def draw(self):
+        '''Desenha a tela de regras inteira. Como nada muda, só é chamada no primeiro quadro'''
         self.screen.fill([255, 184, 122])
 
         self.screen.blit(RULES_CONSTANTS['TITLE'], [10, 10])
@@ -50,5 +59,3 @@ class Rules(Screen):
         self.screen.blit(RULES_CONSTANTS['RULE_11'], [10, 335])
 
         self.screen.blit(RULES_CONSTANTS['BACK'], [180, 370])
-
-        pygame.display.update()
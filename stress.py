@@ -0,0 +1,137 @@
+'''
+Teste de carga: aumenta aos poucos a frequência de inimigos e lança shurikens
+automaticamente, sem fim de jogo, até que o tempo de quadro passe do limite.
+No fim, mostra quantas entidades estavam na tela em cada etapa e quanto tempo
+cada quadro levou, para saber quantas entidades uma máquina aguenta.
+
+Uso:
+    python stress.py [--start-interval MS] [--factor F] [--stage-frames N]
+                     [--budget MS] [--fire-every N] [--max-stages N] [--seed N]
+'''
+import offscreen  # Escolhe os drivers "dummy" do SDL; precisa vir antes do pygame
+import argparse
+import time
+import pygame
+from constants import FRAME_RATE
+from game import HardGame
+from utils import percentile
+
+pygame.init()
+
+
+def run_stage(game, spawn_interval, frames, fire_every):
+    '''
+    Executa uma etapa do teste com um intervalo fixo entre inimigos. Cada quadro
+    executa um passo de simulação, desenha o jogo e atualiza a tela.
+
+    Args:
+        game (Game): jogo sem fim de jogo, reaproveitado entre etapas
+        spawn_interval (float): milissegundos entre inimigos nesta etapa
+        frames (int): número de quadros da etapa
+        fire_every (int): lança um shuriken para cada lado a cada fire_every quadros
+
+    Returns:
+        dict: intervalo, entidades na tela (média e máximo) e percentis do tempo de quadro em ms
+    '''
+    game.enemy_ninja_controller.spawn_time = spawn_interval
+
+    shurikens = game.shuriken_controller.shurikens
+    enemy_ninjas = game.enemy_ninja_controller.enemy_ninjas
+
+    frame_times = []
+    entity_counts = []
+
+    for frame in range(frames):
+        start = time.perf_counter()
+
+        if frame % fire_every == 0:
+            game.shuriken_controller.throw('RIGHT')
+            game.shuriken_controller.throw('LEFT')
+
+        game.step()
+        game.draw()
+        pygame.display.update()
+
+        frame_times.append((time.perf_counter() - start) * 1000)
+        entity_counts.append(len(shurikens) + len(enemy_ninjas))
+
+    frame_times.sort()
+
+    return {
+        'spawn_interval': spawn_interval,
+        'entities': sum(entity_counts) / len(entity_counts),
+        'max_entities': max(entity_counts),
+        'p50': percentile(frame_times, 50),
+        'p95': percentile(frame_times, 95),
+    }
+
+
+def run_stress(start_interval=1500, factor=0.7, stage_frames=120, budget_ms=1000 / FRAME_RATE,
+               fire_every=1, max_stages=40, seed=None):
+    '''
+    Diminui o intervalo entre inimigos a cada etapa até que o p95 do tempo
+    de quadro de uma etapa passe do limite, ou até max_stages etapas.
+
+    Args:
+        start_interval (float): milissegundos entre inimigos na primeira etapa
+        factor (float): multiplica o intervalo a cada etapa (menor que 1 acelera)
+        stage_frames (int): quadros por etapa
+        budget_ms (float): limite do tempo de quadro; o padrão é o de FRAME_RATE
+        fire_every (int): lança shurikens a cada fire_every quadros
+        max_stages (int): número máximo de etapas
+        seed (int): semente do gerador aleatório da partida, opcional
+
+    Returns:
+        list: resultado de cada etapa (ver run_stage)
+    '''
+    game = HardGame(headless=True, seed=seed, spawn_interval=start_interval)
+    game.collision_controller.gameover_enabled = False
+
+    stages = []
+    spawn_interval = start_interval
+
+    for _ in range(max_stages):
+        stage = run_stage(game, spawn_interval, stage_frames, fire_every)
+        stages.append(stage)
+
+        if stage['p95'] > budget_ms:
+            break
+
+        spawn_interval *= factor
+
+    return stages
+
+
+def print_report(stages, budget_ms):
+    '''Mostra uma tabela de entidades na tela contra tempo de quadro'''
+    print(f"{'etapa':>5} {'intervalo ms':>13} {'entidades':>10} {'máx':>6} {'p50 ms':>9} {'p95 ms':>9}")
+
+    for i, stage in enumerate(stages):
+        over = '  acima do limite' if stage['p95'] > budget_ms else ''
+
+        print(f"{i:>5} {stage['spawn_interval']:>13.2f} {stage['entities']:>10.1f} {stage['max_entities']:>6} "
+              f"{stage['p50']:>9.3f} {stage['p95']:>9.3f}{over}")
+
+    within = [stage for stage in stages if stage['p95'] <= budget_ms]
+
+    if within:
+        print(f"Dentro do limite de {budget_ms:.2f} ms: até {max(stage['max_entities'] for stage in within)} entidades")
+    else:
+        print(f"Nenhuma etapa ficou dentro do limite de {budget_ms:.2f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de carga com cada vez mais inimigos')
+    parser.add_argument('--start-interval', type=float, default=1500, help='ms entre inimigos na primeira etapa')
+    parser.add_argument('--factor', type=float, default=0.7, help='multiplica o intervalo a cada etapa')
+    parser.add_argument('--stage-frames', type=int, default=120, help='quadros por etapa')
+    parser.add_argument('--budget', type=float, default=1000 / FRAME_RATE, help='limite do tempo de quadro em ms')
+    parser.add_argument('--fire-every', type=int, default=1, help='lança shurikens a cada N quadros')
+    parser.add_argument('--max-stages', type=int, default=40, help='número máximo de etapas')
+    parser.add_argument('--seed', type=int, help='semente do gerador aleatório')
+    args = parser.parse_args()
+
+    stages = run_stress(args.start_interval, args.factor, args.stage_frames, args.budget,
+                        args.fire_every, args.max_stages, args.seed)
+
+    print_report(stages, args.budget)
@@ -1,10 +1,76 @@
+import os
+import sys
+import time
+import atexit
+import heapq
+import queue
+import sqlite3
+import threading
 import pygame
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+
+class TextCache:
+    '''
+    Cache LRU de tamanho limitado para textos renderizados. Cada combinação
+    de texto, fonte e cor é rasterizada uma única vez enquanto estiver no cache.
+    As superfícies retornadas são compartilhadas e não devem ser alteradas.
+    '''
+
+    def __init__(self, maxsize=256):
+        '''
+        Args:
+            maxsize (int): número máximo de superfícies guardadas
+        '''
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, font, color):
+        '''
+        Returns:
+            pygame.Surface: o texto renderizado, vindo do cache se possível
+        '''
+        key = (text, font, tuple(color))
+        surface = self.surfaces.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)  # Descarta o usado há mais tempo
+
+        return surface
+
+    def info(self):
+        '''Returns: dicionário com acertos, falhas, tamanho atual e tamanho máximo do cache'''
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.surfaces), 'maxsize': self.maxsize}
+
+    def clear(self):
+        '''Esvazia o cache e zera os contadores'''
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
 
 
 def render_font(text, font, color=[0, 0, 0]):
     '''
     Função que gera texto pronto para ser exibido
-    na tela por pygame.
+    na tela por pygame. O resultado vem de text_cache,
+    então textos repetidos são rasterizados uma única vez.
 
     Args:
         text (string): o texto a ser apresentado
@@ -12,9 +78,21 @@ def render_font(text, font, color=[0, 0, 0]):
         color (list): RGB cor do texto
 
     Returns:
-        pygame.Surface: texto pronto para ser exibido na tela
+        pygame.Surface: texto pronto para ser exibido na tela (compartilhado, não deve ser alterado)
+    '''
+    return text_cache.get(text, font, color)
+
+
+def percentile(values, percent):
     '''
-    return font.render(text, True, color)
+    Args:
+        values (list): amostras ordenadas
+        percent (float): percentil desejado, entre 0 e 100
+
+    Returns: amostra correspondente ao percentil (método do posto mais próximo)
+    '''
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
 
 
 class Screen:
@@ -23,25 +101,104 @@ class Screen:
     e atributos compartilhados por todas as telas de jogo.
     '''
 
+    SIZE = (675, 400)
+
+    # Tipos de evento tratados pela tela; os demais são descartados pelo pygame antes da fila
+    EVENT_TYPES = [pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE]
+
+    # Telas reutilizáveis são criadas uma vez e reabertas com reset (ver main.ScreenManager)
+    reusable = False
+
     def __init__(self, name=''):
         '''
         Inicializa uma janela de pygame, inicializa
         propriedade, declara next_screen, e
         armazena o nome do jogador, se houver algum.
+        A janela só é criada na primeira tela; as seguintes
+        reutilizam a mesma superfície.
 
         Args:
             name (string): nome do jogador, opcional.
         '''
+        display = pygame.display.get_surface()
 
-        pygame.display.set_caption('The Meditating Dog')
-        self.screen = pygame.display.set_mode([675, 400])
+        if display is None or display.get_size() != self.SIZE:
+            pygame.display.set_caption('The Meditating Dog')
+            display = pygame.display.set_mode(self.SIZE)
 
+        self.screen = display
+
+        # Chamada explícita: as versões de reset das subclasses só valem ao reabrir a tela
+        Screen.reset(self, name)
+
+    def reset(self, name=''):
+        '''
+        Prepara a tela para ser aberta (de novo): volta a executar, esquece
+        o redirecionamento anterior, guarda o nome do jogador e marca a
+        tela inteira para ser redesenhada.
+
+        Args:
+            name (string): nome do jogador, opcional.
+        '''
         self.run = True
 
         self.next_screen = None
 
         self.name = name
 
+        # Regiões da tela que mudaram desde o último quadro enviado à janela
+        self.dirty_rects = []
+        self.full_redraw = True
+
+        self.allow_events()
+
+    def allow_events(self):
+        '''
+        Deixa entrar na fila de eventos somente os tipos em EVENT_TYPES. Movimentos
+        do mouse, texto digitado, joysticks e outros eventos que a tela não usa
+        não chegam a pygame.event.get.
+        '''
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.EVENT_TYPES)
+
+    def invalidate(self, rect=None):
+        '''
+        Marca uma região da tela para ser redesenhada no próximo quadro.
+
+        Args:
+            rect (pygame.Rect): região alterada, ou None para a tela inteira
+        '''
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def draw(self):
+        '''Desenha a tela inteira. Deve ser implementado pelas telas que usam redraw.'''
+        raise NotImplementedError
+
+    def redraw(self):
+        '''
+        Redesenha somente as regiões marcadas por invalidate e envia
+        somente elas para a janela. Cada região é redesenhada chamando draw
+        com a área de recorte da tela limitada à região, então telas estáticas
+        não custam nada depois do primeiro quadro.
+        '''
+        if self.full_redraw:
+            self.draw()
+            pygame.display.update()
+
+        elif self.dirty_rects:
+            for rect in self.dirty_rects:
+                self.screen.set_clip(rect)
+                self.draw()
+
+            self.screen.set_clip(None)
+            pygame.display.update(self.dirty_rects)
+
+        self.full_redraw = False
+        self.dirty_rects = []
+
     def stop_running(self):
         '''Atributo do conjunto a falso'''
         self.run = False
@@ -56,68 +213,489 @@ class Ranking:
     Classe que define um objeto do Ranking. O objeto está conectado a um 
     arquivo de texto. Considere a linha N (onde N é estranho) como sendo o nome de 
     o jogador e a linha N + 1 a pontuação desse jogador.
+    O arquivo funciona como um registro somente de acréscimo: cada novo recorde
+    é adicionado ao final, e o último registro de um jogador é o que vale.
+    De tempos em tempos o arquivo é compactado, mantendo um registro por jogador.
+    Os top_size melhores jogadores são mantidos em uma lista ordenada que é
+    atualizada a cada recorde, sem reordenar todos os jogadores.
     '''
 
-    def __init__(self, path):
+    # O arquivo é compactado quando tem mais registros que isso vezes o número de jogadores
+    COMPACTION_RATIO = 2
+    # ... mais esta folga, para que arquivos pequenos não sejam compactados o tempo todo
+    COMPACTION_SLACK = 64
+
+    def __init__(self, path, top_size=10):
         '''
         Lê um determinado arquivo de texto e inicializa um mapeamento de atributos
         cada nome para cada pontuação como um dicionário. Inicializa um 
-        atributo contendo uma lista ordenada de nomes, e o caminho
+        atributo contendo uma lista ordenada dos top_size melhores, e o caminho
         ao arquivo de texto também se torna um atributo.
+        Se o arquivo terminar em um nome sem pontuação (uma escrita interrompida),
+        esse nome é descartado e o arquivo é compactado. Um último registro
+        completo sem a quebra de linha final é aceito; ela é acrescentada na próxima escrita.
 
         Args:
             path (string): caminho para o arquivo de texto com nomes e pontuações.
+            top_size (int): número de melhores jogadores mantidos em ordem
+
+        Raises:
+            ValueError: se uma pontuação não for um número; o arquivo não é alterado
         '''
-        with open(path, 'r') as f:
-            lines = f.read().splitlines()  # Armazena cada linha em uma matriz
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        # Com o \n final, o último item é vazio; sem ele, é a última linha
+        lines = content.split(b'\n')
+
+        if lines[-1] == b'':
+            lines.pop()
+
+        # Um nome sem a pontuação depois dele só pode ser o fim de uma escrita interrompida
+        incomplete = len(lines) % 2 == 1
+
+        if incomplete:
+            lines.pop()
 
         players = {}
 
-        for i in range(0, len(lines) - 1, 2):  # Mapas de cada nome para cada pontuação
-            players[lines[i]] = int(lines[i + 1])
+        for i in range(0, len(lines), 2):  # Mapas de cada nome para cada pontuação
+            try:
+                score = int(lines[i + 1])
+            except ValueError:
+                raise ValueError(f'{path}, linha {i + 2}: pontuação inválida {lines[i + 1]!r}') from None
 
-        # Cria uma lista ordenada de nomes com base na pontuação do jogador.
-        leaderboard = sorted(players, key=players.get, reverse=True)
+            players[lines[i].decode().rstrip('\r')] = score
 
         self.__players = players
-        self.__leaderboard = leaderboard
+
+        # Ordem de chegada de cada jogador, usada para desempatar (o primeiro a chegar fica na frente)
+        self.__sequence = {name: i for i, name in enumerate(players)}
+
+        # Chaves (-pontuação, chegada, nome) dos melhores jogadores, em ordem crescente
+        self.__top_size = top_size
+        self.__top = heapq.nsmallest(top_size, map(self.__key, players))
+
+        self.__records = len(lines) // 2
 
         self.__path = path
 
+        # O próximo acréscimo precisa começar em uma linha nova
+        self.__missing_newline = not incomplete and not content.endswith(b'\n') and bool(content)
+
+        if incomplete:
+            self.export_players()
+
     def update(self):
         '''Realiza a atualização de atributos do construtor com mudanças no arquivo de texto'''
-        self.__init__(self.__path)
+        self.__init__(self.__path, self.__top_size)
+
+    def __key(self, name):
+        '''Returns: chave de ordenação do jogador no ranking'''
+        return (-self.__players[name], self.__sequence[name], name)
 
     def export_players(self):
-        '''Re-escreve o arquivo de texto com os jogadores e as pontuações armazenadas no atributo do objeto'''
-        with open(self.__path, 'w') as f:
+        '''
+        Re-escreve o arquivo de texto com os jogadores e as pontuações armazenadas no atributo
+        do objeto (compactação). O conteúdo é escrito em um arquivo temporário, gravado no disco
+        e só então renomeado sobre o original, então uma falha nunca deixa o arquivo pela metade.
+        '''
+        temporary_path = f'{self.__path}.tmp'
+
+        with open(temporary_path, 'w', newline='\n') as f:
             for player in self.__players.keys():
                 f.write(f'{player}\n')
                 f.write(f'{self.__players[player]}\n')
 
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary_path, self.__path)
+
+        self.__sync_directory()
+
+        self.__records = len(self.__players)
+        self.__missing_newline = False
+
+    def __sync_directory(self):
+        '''Grava no disco a entrada do diretório, para que a renomeação sobreviva a uma queda de energia'''
+        if not hasattr(os, 'O_DIRECTORY'):  # Não disponível no Windows
+            return
+
+        directory = os.open(os.path.dirname(os.path.abspath(self.__path)), os.O_RDONLY | os.O_DIRECTORY)
+
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def append_record(self, name, score):
+        '''Acrescenta um registro ao final do arquivo e o grava no disco'''
+        with open(self.__path, 'a', newline='\n') as f:
+            if self.__missing_newline:
+                f.write('\n')
+                self.__missing_newline = False
+
+            f.write(f'{name}\n{score}\n')
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.__records += 1
+
     def new_record(self, name, score):
         '''
         Economiza uma nova pontuação em um dicionário (__players attribute)
-        e atualiza o arquivo de texto. Se o jogador já tem uma pontuação e 
-        a nova não é sua maior função, a função não funciona.
+        e acrescenta o registro ao arquivo de texto, sem reescrevê-lo nem relê-lo.
+        Se o jogador já tem uma pontuação e a nova não é sua maior função,
+        a função não funciona.
 
         Args:
             name (string): nome do jogador
             score (int): pontuação do jogador
         '''
-        if name in self.__players and self.__players[name] > score:
+        if name in self.__players and self.__players[name] >= score:
             return
 
+        if name in self.__players:
+            old_key = self.__key(name)
+            i = bisect_left(self.__top, old_key)
+
+            # A pontuação só aumenta, então quem já está entre os melhores continua lá
+            if i < len(self.__top) and self.__top[i] == old_key:
+                del self.__top[i]
+        else:
+            self.__sequence[name] = len(self.__sequence)
+
         self.__players[name] = score
+        self.__update_top(self.__key(name))
 
-        self.export_players()
+        if self.__records + 1 > self.COMPACTION_RATIO * len(self.__players) + self.COMPACTION_SLACK:
+            self.export_players()
+        else:
+            self.append_record(name, score)
 
-        self.update()
+    def version(self):
+        '''Returns: valor que muda sempre que o arquivo de texto é alterado'''
+        stat = os.stat(self.__path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __update_top(self, key):
+        '''Insere a chave de um jogador entre os melhores, se ela couber, sem reordenar a lista'''
+        if len(self.__top) < self.__top_size or key < self.__top[-1]:
+            insort(self.__top, key)
+
+            if len(self.__top) > self.__top_size:
+                self.__top.pop()
+
+    def get_top(self, n):
+        '''
+        Args:
+            n (int): número de jogadores; até top_size, não é preciso ordenar ninguém
+
+        Returns: lista de pares (nome, pontuação) dos n jogadores com maior pontuação
+        '''
+        if n <= self.__top_size:
+            top = self.__top[:n]
+        else:
+            top = heapq.nsmallest(n, map(self.__key, self.__players))
+
+        return [(name, -score) for score, _, name in top]
 
     def get_leaderboard(self):
-        '''Returns: dicionário que mapeia nomes para pontuações'''
-        return self.__leaderboard
+        '''Returns: lista com os nomes dos top_size melhores jogadores, ordenados por pontuação'''
+        return [name for _, _, name in self.__top]
 
     def get_players(self):
-        '''Returns: lista de nomes de jogadores ordenados por pontuação'''
+        '''Returns: dicionário que mapeia nomes para pontuações'''
         return self.__players
+
+
+class SQLiteRanking:
+    '''
+    Ranking guardado em um banco SQLite, com a mesma interface de Ranking.
+    Seguro para várias instâncias do jogo usando o mesmo arquivo ao mesmo
+    tempo: cada recorde é gravado em uma transação que mantém somente a
+    maior pontuação de cada jogador, e o modo WAL permite leituras
+    simultâneas às escritas. As maiores pontuações são lidas por um índice.
+    '''
+
+    def __init__(self, path, legacy_path=None, top_size=10):
+        '''
+        Abre (ou cria) o banco e, na primeira vez, importa os jogadores do
+        arquivo de texto antigo.
+
+        Args:
+            path (string): caminho para o arquivo do banco
+            legacy_path (string): arquivo de texto no formato de Ranking a ser importado, opcional
+            top_size (int): número de jogadores retornados por get_leaderboard
+        '''
+        self.__top_size = top_size
+
+        # isolation_level=None: as transações são abertas explicitamente com BEGIN
+        self.__connection = sqlite3.connect(path, timeout=10, isolation_level=None)
+
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS players (name TEXT PRIMARY KEY, score INTEGER NOT NULL)'
+        )
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS players_score ON players (score DESC)')
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS migrations (source TEXT PRIMARY KEY)')
+
+        if legacy_path:
+            self.migrate(legacy_path)
+
+    def migrate(self, legacy_path):
+        '''
+        Importa uma única vez os jogadores de um arquivo de texto no formato de Ranking.
+        A importação fica registrada no banco, então outras instâncias não a repetem.
+        '''
+        with self.__transaction():
+            done = self.__connection.execute(
+                'SELECT 1 FROM migrations WHERE source = ?', (legacy_path,)
+            ).fetchone()
+
+            if done or not os.path.exists(legacy_path):
+                return
+
+            for name, score in Ranking(legacy_path).get_players().items():
+                self.__upsert(name, score)
+
+            self.__connection.execute('INSERT INTO migrations (source) VALUES (?)', (legacy_path,))
+
+    def __transaction(self):
+        '''Returns: gerenciador de contexto de uma transação que já reserva a escrita (BEGIN IMMEDIATE)'''
+        return _SQLiteTransaction(self.__connection)
+
+    def __upsert(self, name, score):
+        self.__connection.execute(
+            '''
+            INSERT INTO players (name, score) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET score = excluded.score WHERE excluded.score > players.score
+            ''',
+            (name, score)
+        )
+
+    def update(self):
+        '''As consultas sempre leem o banco, então não há nada para atualizar'''
+
+    def new_record(self, name, score):
+        '''
+        Salva uma nova pontuação, em uma transação, somente se for a maior do jogador.
+
+        Args:
+            name (string): nome do jogador
+            score (int): pontuação do jogador
+        '''
+        with self.__transaction():
+            self.__upsert(name, score)
+
+    def version(self):
+        '''Returns: valor que muda sempre que o banco é alterado, por esta ou por outra conexão'''
+        data_version = self.__connection.execute('PRAGMA data_version').fetchone()[0]
+        return (data_version, self.__connection.total_changes)
+
+    def get_top(self, n):
+        '''Returns: lista de pares (nome, pontuação) dos n jogadores com maior pontuação'''
+        return self.__connection.execute(
+            'SELECT name, score FROM players ORDER BY score DESC, rowid LIMIT ?', (n,)
+        ).fetchall()
+
+    def get_leaderboard(self):
+        '''Returns: lista com os nomes dos top_size melhores jogadores, ordenados por pontuação'''
+        return [name for name, _ in self.get_top(self.__top_size)]
+
+    def get_players(self):
+        '''Returns: dicionário que mapeia nomes para pontuações'''
+        return dict(self.__connection.execute('SELECT name, score FROM players ORDER BY rowid'))
+
+    def close(self):
+        '''Fecha a conexão com o banco'''
+        self.__connection.close()
+
+
+class _SQLiteTransaction:
+    '''Transação que confirma as mudanças ao sair do bloco with, ou as desfaz em caso de erro'''
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_ranking(path, legacy_path='high_scores.txt', top_size=10):
+    '''
+    Abre o ranking guardado em path, escolhendo o formato pela extensão:
+    SQLite para .db, .sqlite e .sqlite3, arquivo de texto para as demais.
+
+    Args:
+        path (string): caminho para o arquivo do ranking
+        legacy_path (string): arquivo de texto importado na criação de um banco SQLite
+        top_size (int): número de melhores jogadores mantidos em ordem
+
+    Returns: Ranking ou SQLiteRanking
+    '''
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SQLiteRanking(path, legacy_path, top_size)
+
+    return Ranking(path, top_size)
+
+
+class RankingWriter:
+    '''
+    Grava os recordes em uma thread separada, para que ler e escrever o
+    arquivo do ranking (às vezes em uma pasta de rede) não trave o jogo.
+    Os recordes esperam em uma fila; a thread grava em lote todos os que
+    chegaram juntos. O ranking é aberto (lido) uma única vez pela thread e
+    mantido aberto, então cada recorde custa só um acréscimo ao arquivo; ele
+    só é relido se outro processo alterou o arquivo. Depois de cada lote, os
+    top_size melhores são publicados em leaderboard, para que a tela de alta
+    pontuação não precise ler o arquivo. Ao fechar o
+    programa, a fila é esvaziada antes de sair, então nenhum recorde se perde.
+    '''
+
+    def __init__(self, path, top_size=10):
+        '''
+        Args:
+            path (string): caminho do ranking, no formato aceito por open_ranking
+            top_size (int): número de melhores jogadores publicados em leaderboard
+        '''
+        self.path = path
+        self.top_size = top_size
+
+        # (versão, lista de pares (nome, pontuação)); substituída inteira pela thread a cada mudança
+        self.leaderboard = (0, [])
+
+        self.queue = queue.Queue()
+        self.thread = None
+
+        # Usados somente pela thread de gravação
+        self.ranking = None
+        self.ranking_version = None  # Versão do arquivo depois da última gravação desta thread
+
+        atexit.register(self.flush)
+
+    def start(self):
+        '''Cria a thread de gravação, se ela ainda não existe ou se terminou'''
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.__run, name='ranking-writer', daemon=True)
+            self.thread.start()
+
+    def submit(self, name, score):
+        '''
+        Entrega um recorde para ser gravado, sem esperar a gravação.
+
+        Args:
+            name (string): nome do jogador
+            score (int): pontuação do jogador
+        '''
+        self.start()
+
+        self.queue.put((name, score))
+
+    def refresh(self):
+        '''Pede que a thread confira se o arquivo mudou e publique os melhores de novo, sem esperar'''
+        self.start()
+
+        self.queue.put(None)
+
+    def flush(self, timeout=None):
+        '''
+        Espera até que todos os recordes entregues tenham sido gravados.
+
+        Args:
+            timeout (float): espera máxima em segundos, opcional
+
+        Returns: verdadeiro se a fila foi esvaziada a tempo
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if self.thread is None or not self.thread.is_alive():
+                    return False
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+
+                if remaining is not None and remaining <= 0:
+                    return False
+
+                # Acorda de tempos em tempos para perceber se a thread terminou
+                self.queue.all_tasks_done.wait(0.1 if remaining is None else min(remaining, 0.1))
+
+        return True
+
+    def __run(self):
+        while True:
+            batch = [self.queue.get()]
+
+            while True:  # Junta ao lote tudo o que já estiver na fila
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not None]  # None é um pedido de refresh
+
+            try:
+                if records:
+                    self.write(records)
+                else:
+                    self.open()
+
+                self.publish()
+            except Exception as error:  # Qualquer erro: a thread precisa continuar atendendo a fila
+                print(f'Não foi possível gravar {len(batch)} recorde(s) em {self.path}: {error!r}', file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def write(self, batch):
+        '''
+        Grava um lote de recordes, guardando somente a maior pontuação de cada jogador.
+
+        Args:
+            batch (list): pares (nome, pontuação)
+        '''
+        best = {}
+
+        for name, score in batch:
+            best[name] = max(score, best.get(name, score))
+
+        ranking = self.open()
+
+        for name, score in best.items():
+            ranking.new_record(name, score)
+
+        self.ranking_version = ranking.version()
+
+    def publish(self):
+        '''Publica os melhores jogadores do ranking mantido pela thread, se mudaram (custo O(top_size))'''
+        version, top = self.leaderboard
+        new_top = self.ranking.get_top(self.top_size)
+
+        if new_top != top:
+            self.leaderboard = (version + 1, new_top)
+
+    def open(self):
+        '''
+        Returns: o ranking mantido pela thread, aberto na primeira chamada e
+            relido somente se o arquivo mudou desde a última gravação desta thread
+        '''
+        if self.ranking is None:
+            self.ranking = open_ranking(self.path)
+        elif self.ranking.version() != self.ranking_version:
+            self.ranking.update()
+
+        self.ranking_version = self.ranking.version()
+
+        return self.ranking